@@ -1,44 +1,261 @@
 """
 FastAPI Application
 Explainable Credit Default Prediction System
+
+Importing this module is deliberately cheap: no MLflow, SHAP or pandas
+import happens until the models are loaded at startup, so the app object
+(and `/health`) is available before the scoring stack is warm.
 """
 
-from fastapi import FastAPI, HTTPException
-from mlflow.tracking import MlflowClient
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response
 
-from inference.predictor import CreditRiskPredictor
-from inference.explain import CreditRiskExplainer
+from api import wire
 from api.schemas import (
+    BatchCreditLookupRequest,
+    BatchCreditRequest,
+    BatchCreditResponse,
+    CreditLookupRequest,
     CreditRequest,
     CreditResponse,
     ExplainResponse,
     HealthResponse,
     ModelInfoResponse,
+    ReadinessResponse,
 )
+from inference.feature_schema import ID_COL
+
+# Configuration
+MODEL_NAME = "CreditRiskLightGBM"
+DECISION_THRESHOLD = 0.4
+
+# eager      -> predictor and explainer loaded before the service is ready
+# background -> ready once the predictor is loaded, explainer warmed afterwards
+# lazy       -> explainer (and shap) only loaded on the first /explain call
+EXPLAINER_MODE = os.getenv("CREDIT_API_EXPLAINER_MODE", "background")
+EXPLAINER_MODES = ("eager", "background", "lazy")
+
+# Scoring path for the champion: full | trees:N | float32 | cascade[:slack]
+# (see inference/model_variants.py). Variants serve no calibrated_pd, and
+# counterfactuals are searched on the variant; SHAP uses the full model
+MODEL_VARIANT = os.getenv("CREDIT_API_MODEL_VARIANT", "full")
+
+# Shadow scoring: comma-separated "Name" or "Name@version" challengers
+CHALLENGERS = os.getenv("CREDIT_API_CHALLENGERS", "")
+SHADOW_SAMPLE_RATE = float(os.getenv("CREDIT_API_SHADOW_RATE", "0.1"))
+DECISION_LOG_DIR = os.getenv("CREDIT_API_DECISION_LOG_DIR", "logs/decisions")
+
+# Applicant history lookup by id (built with `python -m inference.feature_store`)
+FEATURE_STORE_PATH = os.getenv("CREDIT_API_FEATURE_STORE", "data/feature_store.sqlite")
+
+# Model State (populated by the startup loader thread)
+predictor = None
+explainer = None
+shadow = None
+feature_store = None
+MODEL_LOADED = False
+LOAD_ERROR = None
+EXPLAINER_ERROR = None
+SHADOW_ERROR = None
+
+_explainer_lock = threading.Lock()
+
+
+def _load_predictor():
+    global predictor, MODEL_LOADED, LOAD_ERROR
+
+    try:
+        from inference.predictor import CreditRiskPredictor
+
+        predictor = CreditRiskPredictor(threshold=DECISION_THRESHOLD, variant=MODEL_VARIANT)
+        MODEL_LOADED = True
+    except Exception as e:
+        predictor = None
+        MODEL_LOADED = False
+        LOAD_ERROR = str(e)
+
+
+def _get_explainer():
+    """
+    Return the explainer, loading it (and shap) on first use.
+    Concurrent callers block on the same load instead of racing it.
+    """
+    global explainer, EXPLAINER_ERROR
+
+    if explainer is not None or not MODEL_LOADED:
+        return explainer
+
+    with _explainer_lock:
+        if explainer is None:
+            try:
+                from inference.explain import CreditRiskExplainer
+
+                explainer = CreditRiskExplainer(predictor)
+                EXPLAINER_ERROR = None
+            except Exception as e:
+                EXPLAINER_ERROR = str(e)
+
+    return explainer
+
+
+def _load_shadow():
+    """
+    Decision logging starts with the champion; challengers are attached as
+    they load and never affect readiness.
+    """
+    global shadow, SHADOW_ERROR
+
+    if not MODEL_LOADED:
+        return
+
+    from inference.shadow import ShadowScorer, load_challengers
+
+    decision_logger = None
+    if DECISION_LOG_DIR:
+        from monitoring.decision_log import DecisionLogger
+
+        decision_logger = DecisionLogger(DECISION_LOG_DIR)
+
+    shadow = ShadowScorer(
+        predictor,
+        challengers={},
+        decision_logger=decision_logger,
+        sample_rate=SHADOW_SAMPLE_RATE,
+    )
+
+    try:
+        for name, challenger in load_challengers(
+            CHALLENGERS, predictor.threshold
+        ).items():
+            shadow.add_challenger(name, challenger)
+    except Exception as e:
+        SHADOW_ERROR = str(e)
+
+
+def _load_feature_store():
+    global feature_store
+
+    if FEATURE_STORE_PATH and os.path.exists(FEATURE_STORE_PATH):
+        from inference.feature_store import FeatureStore
+
+        feature_store = FeatureStore(FEATURE_STORE_PATH)
+
+
+def _load_models(mode: str = EXPLAINER_MODE):
+    global LOAD_ERROR
+
+    # Runs in the loader thread: report misconfiguration through /health
+    # instead of raising, which would only kill the thread
+    if mode not in EXPLAINER_MODES:
+        LOAD_ERROR = (
+            f"Unknown explainer mode '{mode}' (CREDIT_API_EXPLAINER_MODE), "
+            f"expected one of {EXPLAINER_MODES}"
+        )
+        return
+
+    _load_predictor()
+    _load_feature_store()
+
+    if mode == "eager":
+        _get_explainer()
+    elif mode == "background":
+        threading.Thread(
+            target=_get_explainer,
+            name="explainer-warmup",
+            daemon=True,
+        ).start()
+
+    _load_shadow()
+
+
+def _is_ready() -> bool:
+    if not MODEL_LOADED:
+        return False
+    if EXPLAINER_MODE == "eager":
+        return explainer is not None
+    return True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load in the background so /health answers while models are loading;
+    # /ready reports when /predict can actually be served.
+    threading.Thread(
+        target=_load_models,
+        name="model-loader",
+        daemon=True,
+    ).start()
+    yield
+
 
 # App Initialization
 app = FastAPI(
     title="Explainable Credit Risk API",
     description="Real-time credit default prediction with governance readiness",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
-# Load Model + Explainer ONCE at Startup
-try:
-    predictor = CreditRiskPredictor(threshold=0.4)
-    explainer = CreditRiskExplainer(predictor)
 
-    MODEL_LOADED = True
-except Exception as e:
-    predictor = None
-    explainer = None
-    MODEL_LOADED = False
-    LOAD_ERROR = str(e)
+def _predict_and_log(features: dict) -> dict:
+    start = time.perf_counter()
+    prediction, prob = predictor.predict_with_probability(features)
+    latency_ms = (time.perf_counter() - start) * 1000
+
+    # Non-blocking: challengers score off the request path
+    if shadow:
+        shadow.submit(features, prediction, latency_ms, champion_probability=prob)
+
+    return prediction
+
+
+def _fill_from_store(lookups: list) -> list:
+    """
+    Stored features per applicant with the request's overrides applied.
+    Raises 404 for unknown ids and 400 for unknown override fields or an
+    `id` override (which would score one customer's history under another id).
+    """
+    if not feature_store:
+        raise HTTPException(
+            status_code=503,
+            detail="Feature store not available",
+        )
+
+    overridden = {f for lk in lookups for f in lk.overrides}
+    if ID_COL in overridden:
+        raise HTTPException(
+            status_code=400,
+            detail=f"'{ID_COL}' cannot be overridden; look up that id instead",
+        )
+
+    unknown = overridden - set(feature_store.columns)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown override fields: {sorted(unknown)}",
+        )
+
+    stored = feature_store.get_many([lk.id for lk in lookups])
+    missing = [lk.id for lk in lookups if lk.id not in stored]
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown applicant ids: {missing[:20]}",
+        )
+
+    return [{**stored[lk.id], **lk.overrides} for lk in lookups]
+
 
 # Routes
 @app.get("/health", response_model=HealthResponse)
 def health_check():
-    if not MODEL_LOADED:
+    if LOAD_ERROR:
         return HealthResponse(
             status=f"error: {LOAD_ERROR}",
             model_loaded=False,
@@ -46,10 +263,25 @@ def health_check():
 
     return HealthResponse(
         status="ok",
-        model_loaded=True,
+        model_loaded=MODEL_LOADED,
     )
 
 
+@app.get("/ready", response_model=ReadinessResponse)
+def readiness_check():
+    readiness = ReadinessResponse(
+        ready=_is_ready(),
+        predictor_loaded=MODEL_LOADED,
+        explainer_loaded=explainer is not None,
+        explainer_mode=EXPLAINER_MODE,
+    )
+
+    if not readiness.ready:
+        return JSONResponse(status_code=503, content=readiness.dict())
+
+    return readiness
+
+
 @app.post("/predict", response_model=CreditResponse)
 def predict_credit_risk(request: CreditRequest):
     if not MODEL_LOADED:
@@ -59,8 +291,113 @@ def predict_credit_risk(request: CreditRequest):
         )
 
     try:
-        prediction = predictor.predict(request.dict())
-        return CreditResponse(**prediction)
+        return CreditResponse(**_predict_and_log(request.dict()))
+
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    except Exception:
+        raise HTTPException(status_code=500, detail="Prediction failed")
+
+
+@app.post("/predict/batch", response_model=BatchCreditResponse)
+def predict_credit_risk_batch(request: BatchCreditRequest):
+    if not MODEL_LOADED:
+        raise HTTPException(
+            status_code=503,
+            detail="Model not loaded. Service unavailable.",
+        )
+
+    try:
+        predictions = predictor.predict_batch(
+            [applicant.dict() for applicant in request.applicants]
+        )
+        return BatchCreditResponse(predictions=predictions)
+
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    except Exception:
+        raise HTTPException(status_code=500, detail="Prediction failed")
+
+
+@app.post("/predict/batch/columnar")
+async def predict_credit_risk_columnar(request: Request):
+    """
+    Batch scoring over Arrow IPC or msgpack (see api/wire.py). The response
+    uses the `Accept` format if it is a supported one, else the request's.
+    """
+    if not MODEL_LOADED:
+        raise HTTPException(
+            status_code=503,
+            detail="Model not loaded. Service unavailable.",
+        )
+
+    try:
+        request_media = wire.media_type(request.headers.get("content-type"))
+    except ValueError as ve:
+        raise HTTPException(status_code=415, detail=str(ve))
+
+    accept = request.headers.get("accept", "").split(";")[0].strip().lower()
+    response_media = accept if accept in wire.CONTENT_TYPES else request_media
+
+    body = await request.body()
+    try:
+        X, ids = wire.decode_request(body, request_media, predictor.features)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Malformed batch payload")
+
+    try:
+        probs = await run_in_threadpool(predictor.predict_proba_matrix, X)
+        calibrated = None
+        if predictor.calibration is not None:
+            calibrated = predictor.calibration.apply(probs)
+
+        content = wire.encode_response(
+            probs, predictor.threshold, response_media, ids, calibrated
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception:
+        raise HTTPException(status_code=500, detail="Prediction failed")
+
+    return Response(content=content, media_type=response_media)
+
+
+@app.post("/predict/by-id", response_model=CreditResponse)
+def predict_credit_risk_by_id(request: CreditLookupRequest):
+    if not MODEL_LOADED:
+        raise HTTPException(
+            status_code=503,
+            detail="Model not loaded. Service unavailable.",
+        )
+
+    features = _fill_from_store([request])[0]
+
+    try:
+        return CreditResponse(**_predict_and_log(features))
+
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
+    except Exception:
+        raise HTTPException(status_code=500, detail="Prediction failed")
+
+
+@app.post("/predict/by-id/batch", response_model=BatchCreditResponse)
+def predict_credit_risk_by_id_batch(request: BatchCreditLookupRequest):
+    if not MODEL_LOADED:
+        raise HTTPException(
+            status_code=503,
+            detail="Model not loaded. Service unavailable.",
+        )
+
+    records = _fill_from_store(request.applicants)
+
+    try:
+        return BatchCreditResponse(predictions=predictor.predict_batch(records))
 
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
@@ -71,7 +408,7 @@ def predict_credit_risk(request: CreditRequest):
 
 @app.post("/explain", response_model=ExplainResponse)
 def explain_credit_decision(request: CreditRequest):
-    if not explainer:
+    if not _get_explainer():
         raise HTTPException(
             status_code=503,
             detail="Explainability service unavailable",
@@ -81,6 +418,9 @@ def explain_credit_decision(request: CreditRequest):
         explanation = explainer.explain(request.dict())
         return ExplainResponse(**explanation)
 
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+
     except Exception:
         raise HTTPException(
             status_code=500,
@@ -88,14 +428,36 @@ def explain_credit_decision(request: CreditRequest):
         )
 
 
+@app.get("/shadow/stats")
+def shadow_stats():
+    if not shadow:
+        raise HTTPException(
+            status_code=503,
+            detail="Shadow scoring not initialised",
+        )
+
+    stats = shadow.stats()
+    if SHADOW_ERROR:
+        stats["error"] = SHADOW_ERROR
+    return stats
+
+
 @app.get("/model-info", response_model=ModelInfoResponse)
 def model_info():
-    client = MlflowClient()
-    versions = client.get_latest_versions("CreditRiskLightGBM")
-    version = versions[0].version if versions else "unknown"
+    if predictor:
+        # Report the version actually being served
+        version = predictor.bundle.version
+    else:
+        from mlflow.tracking import MlflowClient
+
+        client = MlflowClient()
+        versions = client.get_latest_versions(MODEL_NAME)
+        version = versions[0].version if versions else "unknown"
 
     return ModelInfoResponse(
-        model_name="CreditRiskLightGBM",
+        model_name=MODEL_NAME,
         model_version=str(version),
         threshold=predictor.threshold if predictor else 0.0,
-    )
\ No newline at end of file
+        model_variant=predictor.variant_name if predictor else MODEL_VARIANT,
+        features=predictor.features if predictor else [],
+    )
@@ -3,44 +3,40 @@ Pydantic Schemas for Credit Risk API
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Optional
 
+from inference.feature_schema import CREDIT_SCHEMA
 
-class CreditRequest(BaseModel):
-    id: Optional[int] = Field(None, description="Customer ID")
 
-    limit_bal: float
-    gender: int = Field(..., description="1=Male, 2=Female")
-    education: int
-    marital_status: int
-    age: int
-
-    pay_amt1: float
-    pay_amt2: float
-    pay_amt3: float
-    pay_amt4: float
-    pay_amt5: float
-    pay_amt6: float
-
-    bill_amt1: float
-    bill_amt2: float
-    bill_amt3: float
-    bill_amt4: float
-    bill_amt5: float
-    bill_amt6: float
-
-    repayment_status_sep: int
-    repayment_status_aug: int
-    repayment_status_jul: int
-    repayment_status_jun: int
-    repayment_status_may: int
-    repayment_status_apr: int
+# Generated from the feature schema the model is trained with
+CreditRequest = CREDIT_SCHEMA.request_model("CreditRequest")
 
 
 class CreditResponse(BaseModel):
     default_probability: float
     risk_label: str
     decision: str
+    calibrated_pd: Optional[float] = None
+
+
+class BatchCreditRequest(BaseModel):
+    applicants: List[CreditRequest]
+
+
+class BatchCreditResponse(BaseModel):
+    predictions: List[CreditResponse]
+
+
+class CreditLookupRequest(BaseModel):
+    id: int = Field(..., description="Customer ID held in the feature store")
+    overrides: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Feature values that replace the stored ones",
+    )
+
+
+class BatchCreditLookupRequest(BaseModel):
+    applicants: List[CreditLookupRequest]
 
 
 class HealthResponse(BaseModel):
@@ -48,11 +44,23 @@ class HealthResponse(BaseModel):
     model_loaded: bool
 
 
+class ReadinessResponse(BaseModel):
+    ready: bool
+    predictor_loaded: bool
+    explainer_loaded: bool
+    explainer_mode: str
+
+
 class ModelInfoResponse(BaseModel):
     model_name: str
     model_version: str
     threshold: float
+    model_variant: str = "full"
+    # Input columns of the served model, in order (may include `id` for
+    # models trained with it); empty until the model is loaded
+    features: List[str] = []
 
 class ExplainResponse(BaseModel):
     top_contributing_factors: list
-    counterfactual_suggestions: list
\ No newline at end of file
+    counterfactual_suggestions: list
+    counterfactuals: list = []
\ No newline at end of file
@@ -0,0 +1,229 @@
+"""
+Columnar Wire Formats for Batch Scoring
+Explainable Credit Default Prediction System
+
+Binary alternatives to JSON for `/predict/batch/columnar`. Both formats
+decode straight into a float64 feature matrix in model order without
+creating a Python object per applicant or per value.
+
+Arrow (`application/vnd.apache.arrow.stream`)
+    Request:  IPC stream, one numeric column per model feature, optional `id`
+    Response: IPC stream with `id` (if sent), `default_probability`,
+              `calibrated_pd` (if the model is calibrated) and
+              dictionary-encoded `risk_label` / `decision`
+
+msgpack (`application/x-msgpack`)
+    Request:  {"features": [...], "shape": [n, m], "data": <float64 bytes,
+              row-major>, "ids": <int64 bytes, optional>}
+    Response: {"n": n, "default_probability": <float64 bytes>,
+              "calibrated_pd": <float64 bytes, optional>,
+              "high_risk": <uint8 bytes>, "ids": <int64 bytes, optional>}
+
+Byte buffers are little-endian.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Configuration
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+MSGPACK = "application/x-msgpack"
+CONTENT_TYPES = (ARROW_STREAM, MSGPACK)
+ID_COL = "id"
+
+RISK_LABELS = ["LOW_RISK", "HIGH_RISK"]
+DECISIONS = ["APPROVED", "REJECTED"]
+
+
+def media_type(content_type: Optional[str]) -> str:
+    media = (content_type or "").split(";")[0].strip().lower()
+    if media not in CONTENT_TYPES:
+        raise ValueError(
+            f"Unsupported content type '{media}', expected one of {CONTENT_TYPES}"
+        )
+    return media
+
+
+# Requests
+def decode_request(
+    body: bytes, content_type: str, features: List[str]
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Decode a batch request into (X, ids). X is float64 (n, len(features)).
+    """
+    if media_type(content_type) == ARROW_STREAM:
+        return _decode_arrow(body, features)
+    return _decode_msgpack(body, features)
+
+
+def _decode_arrow(body: bytes, features: List[str]):
+    import pyarrow as pa
+
+    table = pa.ipc.open_stream(body).read_all()
+
+    missing = set(features) - set(table.column_names)
+    if missing:
+        raise ValueError(f"Missing required features: {missing}")
+
+    X = np.empty((table.num_rows, len(features)), dtype=np.float64)
+    for j, name in enumerate(features):
+        column = table.column(name)
+        if column.null_count:
+            raise ValueError(f"Null values in feature '{name}'")
+        X[:, j] = column.to_numpy()
+
+    ids = None
+    if ID_COL in table.column_names:
+        column = table.column(ID_COL)
+        if column.null_count:
+            raise ValueError(f"Null values in '{ID_COL}'")
+        ids = column.to_numpy().astype(np.int64, copy=False)
+
+    return X, ids
+
+
+def _decode_msgpack(body: bytes, features: List[str]):
+    import msgpack
+
+    payload = msgpack.unpackb(body, raw=False)
+    sent = list(payload["features"])
+    n_rows, n_cols = payload["shape"]
+
+    if n_cols != len(sent):
+        raise ValueError("Shape does not match the number of features sent")
+    missing = set(features) - set(sent)
+    if missing:
+        raise ValueError(f"Missing required features: {missing}")
+
+    matrix = np.frombuffer(payload["data"], dtype="<f8")
+    if matrix.size != n_rows * n_cols:
+        raise ValueError("Data buffer does not match the declared shape")
+    matrix = matrix.reshape(n_rows, n_cols)
+
+    # Reorder (and drop extra columns) into model order in one take
+    order = [sent.index(f) for f in features]
+    X = matrix[:, order]
+
+    ids = None
+    if payload.get("ids") is not None:
+        ids = np.frombuffer(payload["ids"], dtype="<i8")
+        # Scores are joined to ids by position, so they must line up
+        if len(ids) != n_rows:
+            raise ValueError(f"'ids' has {len(ids)} values for {n_rows} rows")
+
+    return X, ids
+
+
+def encode_request(
+    X: np.ndarray,
+    features: List[str],
+    content_type: str,
+    ids: Optional[np.ndarray] = None,
+) -> bytes:
+    """
+    Client-side counterpart of `decode_request`.
+    """
+    X = np.asarray(X, dtype="<f8")
+
+    if media_type(content_type) == ARROW_STREAM:
+        import pyarrow as pa
+
+        columns = {name: X[:, j] for j, name in enumerate(features)}
+        if ids is not None:
+            columns = {ID_COL: np.asarray(ids, dtype=np.int64), **columns}
+        return _arrow_bytes(pa.table(columns))
+
+    import msgpack
+
+    return msgpack.packb({
+        "features": list(features),
+        "shape": list(X.shape),
+        "data": np.ascontiguousarray(X).tobytes(),
+        "ids": None if ids is None else np.asarray(ids, dtype="<i8").tobytes(),
+    })
+
+
+# Responses
+def encode_response(
+    probs: np.ndarray,
+    threshold: float,
+    content_type: str,
+    ids: Optional[np.ndarray] = None,
+    calibrated: Optional[np.ndarray] = None,
+) -> bytes:
+    # Decide on the raw scores, report them to the same 4 places as the
+    # JSON endpoints (CreditRiskPredictor.decide_batch)
+    high_risk = (probs >= threshold).astype(np.int8)
+    probs = np.round(probs, 4)
+    if calibrated is not None:
+        calibrated = np.round(calibrated, 4)
+
+    if media_type(content_type) == ARROW_STREAM:
+        import pyarrow as pa
+
+        columns = {}
+        if ids is not None:
+            columns[ID_COL] = pa.array(ids)
+        columns["default_probability"] = pa.array(probs)
+        if calibrated is not None:
+            columns["calibrated_pd"] = pa.array(calibrated)
+        columns["risk_label"] = pa.DictionaryArray.from_arrays(
+            high_risk, RISK_LABELS
+        )
+        columns["decision"] = pa.DictionaryArray.from_arrays(high_risk, DECISIONS)
+        return _arrow_bytes(pa.table(columns))
+
+    import msgpack
+
+    return msgpack.packb({
+        "n": int(len(probs)),
+        "default_probability": np.asarray(probs, dtype="<f8").tobytes(),
+        "calibrated_pd": None if calibrated is None
+        else np.asarray(calibrated, dtype="<f8").tobytes(),
+        "high_risk": high_risk.astype(np.uint8).tobytes(),
+        "ids": None if ids is None else np.asarray(ids, dtype="<i8").tobytes(),
+    })
+
+
+def decode_response(body: bytes, content_type: str) -> dict:
+    """
+    Client-side counterpart of `encode_response`: column name -> numpy array.
+    """
+    if media_type(content_type) == ARROW_STREAM:
+        import pyarrow as pa
+
+        table = pa.ipc.open_stream(body).read_all()
+        decoded = {}
+        for name in table.column_names:
+            column = table.column(name).combine_chunks()
+            if pa.types.is_dictionary(column.type):
+                labels = np.asarray(column.dictionary.to_pylist())
+                decoded[name] = labels[column.indices.to_numpy()]
+            else:
+                decoded[name] = column.to_numpy()
+        return decoded
+
+    import msgpack
+
+    payload = msgpack.unpackb(body, raw=False)
+    high_risk = np.frombuffer(payload["high_risk"], dtype=np.uint8)
+    decoded = {
+        "default_probability": np.frombuffer(payload["default_probability"], dtype="<f8"),
+        "risk_label": np.asarray(RISK_LABELS)[high_risk],
+        "decision": np.asarray(DECISIONS)[high_risk],
+    }
+    if payload.get("calibrated_pd") is not None:
+        decoded["calibrated_pd"] = np.frombuffer(payload["calibrated_pd"], dtype="<f8")
+    if payload.get("ids") is not None:
+        decoded[ID_COL] = np.frombuffer(payload["ids"], dtype="<i8")
+    return decoded
+
+
+def _arrow_bytes(table) -> bytes:
+    import pyarrow as pa
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
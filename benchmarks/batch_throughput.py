@@ -0,0 +1,72 @@
+"""
+Bulk Scoring Throughput
+Explainable Credit Default Prediction System
+
+Scores the processed dataset (or a synthetic file of `--rows` applicants
+from training/synthetic.py) with 1..N workers and reports rows/s.
+
+Run from the project root:
+    python -m benchmarks.batch_throughput --rows 10000000 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from inference.batch_score import score_file
+from inference.model_bundle import get_model_bundle
+
+# Configuration
+DATA_PATH = "data/processed/credit_data.csv"
+RANDOM_STATE = 42
+
+
+def build_input(rows: int, workdir: Path) -> Path:
+    if rows <= 0:
+        return Path(DATA_PATH)
+
+    from training.synthetic import generate
+
+    return generate(
+        workdir / f"applicants_{rows}.parquet", rows,
+        seed=RANDOM_STATE, data_path=DATA_PATH, include_target=False,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk scoring throughput")
+    parser.add_argument("--rows", type=int, default=0, help="0 = processed dataset")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--top-k", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        input_path = build_input(args.rows, workdir)
+
+        # Keep model loading out of the timings
+        get_model_bundle()
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            n_rows = score_file(
+                str(input_path),
+                str(workdir / "scores.parquet"),
+                workers=workers,
+                chunk_size=args.chunk_size,
+                top_k=args.top_k,
+            )
+            elapsed = time.perf_counter() - start
+            print({
+                "rows": n_rows,
+                "workers": workers,
+                "seconds": round(elapsed, 2),
+                "rows_per_s": round(n_rows / elapsed),
+            })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Feature Store Lookup Latency
+Explainable Credit Default Prediction System
+
+Builds a synthetic store of `--rows` applicants (same columns as the
+processed dataset, generated by training/synthetic.py) and reports
+single-id and bulk lookup latency, cold (SQLite) and hot (LRU).
+
+Run from the project root:
+    python -m benchmarks.feature_store_lookup --rows 10000000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from inference.feature_store import FeatureStore, build_store_from_frames
+
+# Configuration
+DATA_PATH = "data/processed/credit_data.csv"
+TARGET_COL = "default"
+BLOCK = 500_000
+RANDOM_STATE = 42
+
+
+def synthetic_frames(rows: int):
+    from training.synthetic import GaussianCopula
+
+    source = pd.read_csv(DATA_PATH).drop(columns=[TARGET_COL])
+    yield from GaussianCopula.fit(source).chunks(rows, BLOCK, RANDOM_STATE)
+
+
+def percentiles_us(samples) -> dict:
+    p50, p95, p99 = np.percentile(np.asarray(samples) * 1e6, [50, 95, 99])
+    return {"p50_us": round(float(p50), 1), "p95_us": round(float(p95), 1), "p99_us": round(float(p99), 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Feature store lookup latency")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--batch", type=int, default=1_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(RANDOM_STATE)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "store.sqlite"
+
+        start = time.perf_counter()
+        build_store_from_frames(synthetic_frames(args.rows), db_path)
+        print({"rows": args.rows, "build_s": round(time.perf_counter() - start, 1)})
+
+        ids = rng.integers(1, args.rows + 1, size=args.lookups)
+
+        cold = FeatureStore(db_path, cache_size=0)
+        samples = []
+        for i in ids:
+            t = time.perf_counter()
+            cold.get(int(i))
+            samples.append(time.perf_counter() - t)
+        print({"lookup": "single, uncached", **percentiles_us(samples)})
+
+        hot = FeatureStore(db_path)
+        hot.get_many(ids.tolist())
+        samples = []
+        for i in ids:
+            t = time.perf_counter()
+            hot.get(int(i))
+            samples.append(time.perf_counter() - t)
+        print({"lookup": "single, LRU hit", **percentiles_us(samples)})
+
+        batches = rng.integers(1, args.rows + 1, size=(50, args.batch))
+        t = time.perf_counter()
+        for batch in batches:
+            cold.get_many(batch.tolist())
+        per_batch = (time.perf_counter() - t) / len(batches)
+        print({
+            "lookup": f"bulk {args.batch}, uncached",
+            "ms_per_batch": round(per_batch * 1000, 2),
+            "us_per_id": round(per_batch * 1e6 / args.batch, 2),
+        })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+API Startup Profile
+Explainable Credit Default Prediction System
+
+Measures, in a fresh interpreter per explainer mode:
+- wall time to `import api.main`
+- wall time until the service would report ready
+- resident memory (RSS) at import, at readiness and once the explainer is loaded
+- whether shap / mlflow.lightgbm were imported on the /predict path
+
+Run from the project root (works on older trees that load models at import):
+    python -m benchmarks.startup_profile
+"""
+
+import json
+import subprocess
+import sys
+
+# Configuration
+MODES = ["eager", "background", "lazy"]
+
+PROBE = r"""
+import json, os, sys, time
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+os.environ["CREDIT_API_EXPLAINER_MODE"] = sys.argv[1]
+
+t0 = time.perf_counter()
+import api.main as m
+t_import = time.perf_counter() - t0
+rss_import = rss_mb()
+
+# Older trees load everything at import; newer ones expose _load_models.
+# "background" is loaded as "lazy" so the readiness numbers are taken before
+# the warmup thread starts; the explainer load below is what it would run
+if hasattr(m, "_load_models"):
+    m._load_models("lazy" if sys.argv[1] == "background" else sys.argv[1])
+t_ready = time.perf_counter() - t0
+rss_ready = rss_mb()
+shap_on_predict_path = "shap" in sys.modules
+
+if hasattr(m, "_get_explainer"):
+    m._get_explainer()
+rss_explainer = rss_mb()
+
+print(json.dumps({
+    "mode": sys.argv[1],
+    "import_s": round(t_import, 3),
+    "ready_s": round(t_ready, 3),
+    "rss_import_mb": round(rss_import, 1),
+    "rss_ready_mb": round(rss_ready, 1),
+    "rss_with_explainer_mb": round(rss_explainer, 1),
+    "shap_imported_before_ready": shap_on_predict_path,
+}))
+"""
+
+
+def profile_mode(mode: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE, mode],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    for mode in MODES:
+        print(profile_mode(mode))
+
+
+if __name__ == "__main__":
+    main()
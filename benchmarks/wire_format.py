@@ -0,0 +1,86 @@
+"""
+Batch Wire Format Cost
+Explainable Credit Default Prediction System
+
+Compares the server-side serialization CPU time of one batch request at
+`--rows` applicants for JSON (Pydantic validation + DataFrame) against the
+Arrow IPC and msgpack columnar formats. Model scoring is excluded: the same
+precomputed probabilities are encoded on every path.
+
+Run from the project root (no model or server needed):
+    python -m benchmarks.wire_format --rows 10000
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from api import wire
+from api.schemas import BatchCreditRequest, BatchCreditResponse
+
+# Configuration
+DATA_PATH = "data/processed/credit_data.csv"
+TARGET_COL = "default"
+THRESHOLD = 0.4
+REPEATS = 5
+
+
+def cpu_ms(fn) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.process_time()
+        fn()
+        best = min(best, time.process_time() - start)
+    return round(best * 1000, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch wire format cost")
+    parser.add_argument("--rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    df = pd.read_csv(DATA_PATH).drop(columns=[TARGET_COL])
+    df = df.sample(args.rows, replace=len(df) < args.rows, random_state=42)
+    features = [c for c in df.columns if c != wire.ID_COL]
+    ids = df[wire.ID_COL].to_numpy()
+    X = df[features].to_numpy(dtype=np.float64)
+    probs = np.random.default_rng(42).random(args.rows)
+
+    json_body = json.dumps({"applicants": df.to_dict("records")}).encode()
+
+    def json_path():
+        request = BatchCreditRequest(**json.loads(json_body))
+        frame = pd.DataFrame([a.dict() for a in request.applicants])
+        frame[features].to_numpy(dtype=np.float64)
+
+        high_risk = probs >= THRESHOLD
+        response = BatchCreditResponse(predictions=[
+            {
+                "default_probability": round(float(p), 4),
+                "risk_label": "HIGH_RISK" if h else "LOW_RISK",
+                "decision": "REJECTED" if h else "APPROVED",
+            }
+            for p, h in zip(probs, high_risk)
+        ])
+        response.json()
+
+    results = {"json": {"request_bytes": len(json_body), "server_cpu_ms": cpu_ms(json_path)}}
+
+    for name, media in (("arrow", wire.ARROW_STREAM), ("msgpack", wire.MSGPACK)):
+        body = wire.encode_request(X, features, media, ids=ids)
+
+        def binary_path():
+            decoded, decoded_ids = wire.decode_request(body, media, features)
+            wire.encode_response(probs, THRESHOLD, media, decoded_ids)
+
+        results[name] = {"request_bytes": len(body), "server_cpu_ms": cpu_ms(binary_path)}
+
+    for name, result in results.items():
+        print({"format": name, "rows": args.rows, **result})
+
+
+if __name__ == "__main__":
+    main()
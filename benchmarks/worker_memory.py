@@ -0,0 +1,110 @@
+"""
+Worker Memory Profile
+Explainable Credit Default Prediction System
+
+Starts gunicorn (gunicorn.conf.py) with N uvicorn workers, waits until every
+worker has loaded the model and explainer, and reports the total PSS
+(proportional set size) of the master plus all workers. PSS splits shared
+pages between the processes that map them, so it shows what pre-fork
+sharing actually saves.
+
+Run from the project root (Linux only, reads /proc):
+    python -m benchmarks.worker_memory --workers 1 4 16
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+# Configuration
+PORT = 8765
+WARMUP_TIMEOUT_S = 600
+SETTLE_S = 5.0
+
+
+def pss_kb(pid: int) -> int:
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                return int(line.split()[1])
+    return 0
+
+
+def child_pids(pid: int) -> list:
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(p) for p in f.read().split()]
+
+
+def wait_until_warm(n_workers: int):
+    # Requests land on arbitrary workers; keep polling until enough
+    # consecutive /ready calls report a loaded explainer.
+    deadline = time.time() + WARMUP_TIMEOUT_S
+    streak = 0
+    while time.time() < deadline and streak < 4 * n_workers:
+        try:
+            with urllib.request.urlopen(
+                f"http://127.0.0.1:{PORT}/ready", timeout=5
+            ) as resp:
+                body = resp.read().decode()
+            streak = streak + 1 if '"explainer_loaded":true' in body else 0
+        except Exception:
+            streak = 0
+        time.sleep(0.25)
+
+    if streak < 4 * n_workers:
+        raise RuntimeError("Workers did not become ready in time")
+
+
+def measure(n_workers: int, preload: bool) -> dict:
+    env = dict(
+        os.environ,
+        WEB_CONCURRENCY=str(n_workers),
+        CREDIT_API_BIND=f"127.0.0.1:{PORT}",
+        CREDIT_API_PRELOAD="1" if preload else "0",
+        CREDIT_API_EXPLAINER_MODE="eager",
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "api.main:app"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_warm(n_workers)
+        time.sleep(SETTLE_S)
+
+        workers = child_pids(proc.pid)
+        total_kb = pss_kb(proc.pid) + sum(pss_kb(p) for p in workers)
+
+        return {
+            "workers": len(workers),
+            "preload": preload,
+            "total_pss_mb": round(total_kb / 1024, 1),
+            "pss_per_worker_mb": round(total_kb / 1024 / max(len(workers), 1), 1),
+        }
+    finally:
+        proc.terminate()
+        proc.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=["preload", "per-worker"],
+        default=["per-worker", "preload"],
+    )
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        for n in args.workers:
+            print(measure(n, preload=mode == "preload"))
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,427 @@
-"""Streamlit UI for credit risk prediction & explainability."""
+"""
+Streamlit Frontend
+Explainable Credit Default Prediction System
+
+Client of the FastAPI service (no model is loaded here):
+
+- Single applicant: `/predict` and `/explain` are sent concurrently; the
+  decision is shown as soon as it returns, the explanation when ready
+- Batch: an uploaded CSV is scored in chunks through
+  `/predict/batch/columnar` (msgpack), several chunks in flight, and the
+  results table grows as chunks come back in file order
+- One pooled `requests.Session` (keep-alive) and one thread pool per
+  server process, shared by all browser sessions
+- Responses are cached per payload / per chunk with `st.cache_data`, so
+  reruns and repeated inputs do not hit the API again
+
+Usage:
+    CREDIT_UI_API_URL=http://127.0.0.1:8000 python -m streamlit run frontend/app.py
+
+(`python -m` keeps the repository root importable for `api.wire` and the
+feature schema.)
+"""
+
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, List
+
+import numpy as np
+import pandas as pd
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from urllib3.util.retry import Retry
+
+from api import wire
+from inference.feature_schema import CREDIT_SCHEMA, ID_COL
+
+# Configuration
+API_URL = os.getenv("CREDIT_UI_API_URL", "http://127.0.0.1:8000").rstrip("/")
+PREDICT_TIMEOUT_S = 5
+EXPLAIN_TIMEOUT_S = 30          # the explainer may still be warming up
+BATCH_TIMEOUT_S = 60
+MAX_WORKERS = 8                 # HTTP pool size and thread pool size
+BATCH_CHUNK_SIZE = 2_000
+MAX_CHUNKS_IN_FLIGHT = 4
+PREVIEW_ROWS = 1_000
+CACHE_TTL_S = 600
+CACHE_MAX_ENTRIES = 1_000
+BATCH_MEDIA = wire.MSGPACK
+
+
+# Encoding Maps (UI -> Model)
+GENDER_MAP = {"Male": 1, "Female": 2}
+
+EDUCATION_MAP = {
+    "Graduate": 1,
+    "University": 2,
+    "High School": 3,
+    "Other": 4,
+}
+
+MARITAL_MAP = {
+    "Married": 1,
+    "Single": 2,
+    "Other": 3,
+}
+
+REPAY_STATUS_MAP = {
+    "On Time": 0,
+    "1 Month Delay": 1,
+    "2 Months Delay": 2,
+    "3+ Months Delay": 3,
+}
+
+
+# HTTP
+class APIError(RuntimeError):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(f"{status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=MAX_WORKERS,
+        max_retries=Retry(connect=2, read=0, backoff_factor=0.2),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_resource
+def get_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="credit-ui")
+
+
+def _submit(fn, *args) -> Future:
+    # Pool threads run under the submitting script's context, so cached
+    # functions called from them behave as in the script thread
+    ctx = get_script_run_ctx()
+
+    def run():
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args)
+
+    return get_executor().submit(run)
+
+
+def _check(response: requests.Response) -> requests.Response:
+    if response.status_code != 200:
+        try:
+            detail = response.json().get("detail", response.text)
+        except ValueError:
+            detail = response.text
+        raise APIError(response.status_code, str(detail))
+    return response
+
+
+# Cached API Calls (failures raise and are not cached)
+@st.cache_data(ttl=CACHE_TTL_S, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def fetch_prediction(payload: Dict) -> Dict:
+    response = get_session().post(
+        f"{API_URL}/predict", json=payload, timeout=PREDICT_TIMEOUT_S
+    )
+    return _check(response).json()
+
+
+@st.cache_data(ttl=CACHE_TTL_S, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def fetch_explanation(payload: Dict) -> Dict:
+    response = get_session().post(
+        f"{API_URL}/explain", json=payload, timeout=EXPLAIN_TIMEOUT_S
+    )
+    return _check(response).json()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_model_info() -> Dict:
+    response = get_session().get(f"{API_URL}/model-info", timeout=PREDICT_TIMEOUT_S)
+    return _check(response).json()
+
+
+@st.cache_data(ttl=CACHE_TTL_S, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+def score_chunk(chunk: pd.DataFrame, features: List[str]) -> pd.DataFrame:
+    missing = [f for f in features if f not in chunk.columns]
+    if missing:
+        raise ValueError(f"Missing required features: {missing}")
+
+    X = chunk[features].to_numpy(dtype=np.float64)
+    ids = chunk[ID_COL].to_numpy() if ID_COL in chunk.columns else None
+
+    response = get_session().post(
+        f"{API_URL}/predict/batch/columnar",
+        data=wire.encode_request(X, features, BATCH_MEDIA, ids=ids),
+        headers={"Content-Type": BATCH_MEDIA, "Accept": BATCH_MEDIA},
+        timeout=BATCH_TIMEOUT_S,
+    )
+    decoded = wire.decode_response(_check(response).content, BATCH_MEDIA)
+
+    scored = pd.DataFrame(decoded)
+    if ID_COL in scored.columns:
+        scored = scored[[ID_COL] + [c for c in scored.columns if c != ID_COL]]
+    scored["default_probability"] = scored["default_probability"].round(4)
+    if "calibrated_pd" in scored.columns:
+        scored["calibrated_pd"] = scored["calibrated_pd"].round(4)
+    return scored
+
+
+def score_csv(data: bytes, chunk_size: int = BATCH_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Scored chunks of a CSV, in file order, with a bounded number in flight.
+    Columns are encoded as the served model expects them (`/model-info`),
+    which for models trained with `id` includes the id column.
+    """
+    features = fetch_model_info().get("features") or CREDIT_SCHEMA.features
+
+    pending = deque()
+    for chunk in pd.read_csv(io.BytesIO(data), chunksize=chunk_size):
+        pending.append(_submit(score_chunk, chunk.reset_index(drop=True), features))
+        if len(pending) >= MAX_CHUNKS_IN_FLIGHT:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+
+# Payload
+def build_payload(
+    limit_bal: float,
+    age: int,
+    gender: str,
+    education: str,
+    marital_status: str,
+    pay_amt: float,
+    bill_amt: float,
+    repayment_status: str,
+) -> Dict:
+    # The form collects one representative month; it is used for all six
+    repay = REPAY_STATUS_MAP[repayment_status]
+
+    payload = {
+        "limit_bal": float(limit_bal),
+        "gender": GENDER_MAP[gender],
+        "education": EDUCATION_MAP[education],
+        "marital_status": MARITAL_MAP[marital_status],
+        "age": int(age),
+    }
+    for feature in CREDIT_SCHEMA.features:
+        if feature.startswith("repayment_status_"):
+            payload[feature] = repay
+        elif feature.startswith("bill_amt"):
+            payload[feature] = float(bill_amt)
+        elif feature.startswith("pay_amt"):
+            payload[feature] = float(pay_amt)
+
+    return payload
+
+
+# UI
+def render_header():
+    st.title("Explainable Credit Default Prediction")
+    st.markdown(
+        """
+**Production-style demo UI** for a governed credit risk system.
+
+- FastAPI backend
+- MLflow-registered LightGBM model
+- SHAP-based explainability
+- Fairness-aware design
+
+Demonstration only — not for real lending use.
+"""
+    )
+
+    with st.sidebar:
+        st.subheader("Service")
+        st.caption(API_URL)
+        try:
+            info = fetch_model_info()
+            st.write(f"**Model:** {info['model_name']} v{info['model_version']}")
+            st.write(f"**Threshold:** {info['threshold']}")
+            if "model_variant" in info:
+                st.write(f"**Variant:** {info['model_variant']}")
+        except requests.exceptions.ConnectionError:
+            st.error("FastAPI backend is not running.")
+        except (APIError, requests.exceptions.RequestException) as e:
+            st.warning(f"Model info unavailable: {e}")
+
+
+def render_single():
+    with st.form("credit_form"):
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            limit_bal = st.number_input(
+                "Credit Limit", min_value=0, max_value=1_000_000, value=200_000
+            )
+            age = st.number_input("Age", min_value=18, max_value=100, value=35)
+            gender = st.selectbox("Gender", list(GENDER_MAP.keys()))
+
+        with col2:
+            education = st.selectbox("Education Level", list(EDUCATION_MAP.keys()))
+            marital_status = st.selectbox("Marital Status", list(MARITAL_MAP.keys()))
+            pay_amt = st.number_input(
+                "Recent Monthly Payment", min_value=0, max_value=100_000, value=5000
+            )
+
+        with col3:
+            bill_amt = st.number_input(
+                "Outstanding Bill Amount", min_value=0, max_value=200_000, value=30000
+            )
+            repayment_status = st.selectbox(
+                "Recent Repayment Status", list(REPAY_STATUS_MAP.keys())
+            )
+
+        submit = st.form_submit_button("Evaluate Credit Risk")
+
+    if not submit:
+        return
+
+    payload = build_payload(
+        limit_bal, age, gender, education, marital_status,
+        pay_amt, bill_amt, repayment_status,
+    )
+
+    # Both requests are in flight before waiting on either
+    prediction_future = _submit(fetch_prediction, payload)
+    explanation_future = _submit(fetch_explanation, payload)
+
+    try:
+        with st.spinner("Evaluating credit risk..."):
+            prediction = prediction_future.result()
+    except requests.exceptions.ConnectionError:
+        st.error("FastAPI backend is not running.")
+        return
+    except (APIError, requests.exceptions.RequestException) as e:
+        st.error(f"Prediction failed: {e}")
+        return
+
+    st.subheader("Credit Decision")
+    cols = st.columns(4)
+    cols[0].metric("Default Probability", prediction["default_probability"])
+    cols[1].metric("Risk Category", prediction["risk_label"])
+    cols[2].metric("Decision", prediction["decision"])
+    if prediction.get("calibrated_pd") is not None:
+        cols[3].metric("Calibrated PD", prediction["calibrated_pd"])
+
+    try:
+        with st.spinner("Computing explanation..."):
+            explanation = explanation_future.result()
+    except (APIError, requests.exceptions.RequestException) as e:
+        st.warning(f"Explainability service unavailable: {e}")
+        return
+
+    st.subheader("Explanation")
+
+    st.markdown("**Key Risk Drivers:**")
+    for f in explanation["top_contributing_factors"]:
+        st.write(f"- **{f['feature']}** → {f['direction']} (impact: {f['impact']})")
+
+    st.markdown("**What Could Improve This Outcome:**")
+    for s in explanation["counterfactual_suggestions"]:
+        st.write(f"- {s}")
+
+
+def render_batch():
+    st.markdown(
+        "Upload a CSV with one column per model feature (and optionally `id`). "
+        "Results appear as chunks are scored."
+    )
+    uploaded = st.file_uploader("Applicants CSV", type=["csv"])
+    if uploaded is None:
+        return
+
+    data = uploaded.getvalue()
+    # Content hash: a different file with the same name and size must rescore
+    key = hashlib.sha1(data).hexdigest()
+    results = st.session_state.get("batch_results")
+
+    if results is None or results["key"] != key:
+        if not st.button("Score File"):
+            return
+        scored = _score_progressively(data)
+        if scored is None:
+            return
+        st.session_state["batch_results"] = {"key": key, "frame": scored}
+    else:
+        # Rerun (e.g. after a download): show the stored results
+        scored = results["frame"]
+        st.write(
+            f"**{len(scored):,}** rows · "
+            f"**{(scored['decision'] == 'REJECTED').mean():.1%}** rejected"
+        )
+        st.dataframe(scored.head(PREVIEW_ROWS), use_container_width=True)
+
+    st.download_button(
+        "Download Results",
+        scored.to_csv(index=False).encode("utf-8"),
+        file_name=f"scored_{uploaded.name}",
+        mime="text/csv",
+    )
+
+
+def _score_progressively(data: bytes):
+    total = max(data.count(b"\n") - 1, 1)
+    progress = st.progress(0.0, text="Scoring...")
+    summary = st.empty()
+    table = st.empty()
+
+    chunks, n_rows, n_rejected = [], 0, 0
+    start = time.perf_counter()
+    try:
+        for scored in score_csv(data):
+            chunks.append(scored)
+            n_rows += len(scored)
+            n_rejected += int((scored["decision"] == "REJECTED").sum())
+
+            rate = n_rows / (time.perf_counter() - start)
+            progress.progress(min(n_rows / total, 1.0), text=f"Scored {n_rows:,} rows")
+            summary.write(
+                f"**{n_rows:,}** rows · **{n_rejected / n_rows:.1%}** rejected · "
+                f"{rate:,.0f} rows/s"
+            )
+            if sum(len(c) for c in chunks[:-1]) < PREVIEW_ROWS:
+                table.dataframe(pd.concat(chunks).head(PREVIEW_ROWS), use_container_width=True)
+
+    except requests.exceptions.ConnectionError:
+        st.error("FastAPI backend is not running.")
+        return None
+    except (APIError, ValueError, requests.exceptions.RequestException) as e:
+        st.error(f"Batch scoring failed after {n_rows:,} rows: {e}")
+        return None
+
+    progress.progress(1.0, text=f"Scored {n_rows:,} rows")
+    if n_rows > PREVIEW_ROWS:
+        st.caption(f"Showing the first {PREVIEW_ROWS:,} rows; download for all results.")
+
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+
+def main():
+    st.set_page_config(
+        page_title="Explainable Credit Risk",
+        page_icon="🏦",
+        layout="wide",
+    )
+    render_header()
+
+    single, batch = st.tabs(["Single Applicant", "Batch (CSV)"])
+    with single:
+        render_single()
+    with batch:
+        render_batch()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Gunicorn Configuration (shared-model serving)
+Explainable Credit Default Prediction System
+
+Loads the model bundle once in the gunicorn master, before workers are
+forked, so all uvicorn workers share its read-only memory pages:
+
+    gunicorn -c gunicorn.conf.py api.main:app
+
+Set CREDIT_API_PRELOAD=0 to fall back to one model copy per worker.
+"""
+
+import os
+
+# Configuration
+bind = os.getenv("CREDIT_API_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+PRELOAD_MODEL = os.getenv("CREDIT_API_PRELOAD", "1") == "1"
+preload_app = PRELOAD_MODEL
+
+
+def on_starting(server):
+    if not PRELOAD_MODEL:
+        return
+
+    from inference.model_bundle import preload_for_fork
+
+    explainer_mode = os.getenv("CREDIT_API_EXPLAINER_MODE", "background")
+    preload_for_fork(include_explainer=explainer_mode != "lazy")
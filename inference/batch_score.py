@@ -0,0 +1,207 @@
+"""
+Offline Bulk Scoring
+Explainable Credit Default Prediction System
+
+Streams a CSV or Parquet file of applicants in chunks, scores each chunk
+vectorized across a process pool and streams probabilities, decisions and
+(optionally) top-k SHAP factors to an output CSV/Parquet file.
+
+- Output rows are written in input order
+- At most `2 * workers` chunks are in flight, so memory stays bounded
+- On Linux the model is loaded once in the parent and inherited by workers
+
+Usage:
+    python -m inference.batch_score applicants.csv scores.parquet \\
+        --workers 4 --chunk-size 50000 --top-k 3 [--variant cascade:0.1]
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, Optional
+
+import pandas as pd
+
+from inference.predictor import CreditRiskPredictor
+
+# Configuration
+DEFAULT_CHUNK_SIZE = 50_000
+DEFAULT_THRESHOLD = 0.4
+ID_COL = "id"
+
+_WORKER_PREDICTOR: Optional[CreditRiskPredictor] = None
+_WORKER_EXPLAINER = None
+_WORKER_TOP_K = 0
+_WORKER_THREADS = 0
+
+
+# Input / Output
+def read_chunks(path: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+class ChunkWriter:
+    """
+    Appends scored chunks to a CSV or Parquet file as they arrive.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._parquet_writer = None
+        self._header_written = False
+
+    def write(self, df: pd.DataFrame):
+        if self.path.suffix == ".parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            df.to_csv(
+                self.path,
+                mode="a" if self._header_written else "w",
+                header=not self._header_written,
+                index=False,
+            )
+            self._header_written = True
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+
+# Scoring
+def _init_worker(threshold: float, top_k: int, num_threads: int, variant: str = "full"):
+    global _WORKER_PREDICTOR, _WORKER_EXPLAINER, _WORKER_TOP_K, _WORKER_THREADS
+
+    # Reuses the parent's bundle when forked, loads it otherwise
+    _WORKER_PREDICTOR = CreditRiskPredictor(threshold=threshold, variant=variant)
+    _WORKER_TOP_K = top_k
+    _WORKER_THREADS = num_threads
+
+    if top_k > 0:
+        from inference.explain import CreditRiskExplainer
+
+        _WORKER_EXPLAINER = CreditRiskExplainer(_WORKER_PREDICTOR)
+
+
+def _score_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    probs = _WORKER_PREDICTOR.predict_proba_batch(chunk, num_threads=_WORKER_THREADS)
+    scored = _WORKER_PREDICTOR.decide_batch(probs)
+
+    if ID_COL in chunk.columns:
+        scored.insert(0, ID_COL, chunk[ID_COL].to_numpy())
+
+    if _WORKER_EXPLAINER is not None:
+        factors = _WORKER_EXPLAINER.top_factors_batch(chunk, top_k=_WORKER_TOP_K)
+        scored = pd.concat([scored, factors], axis=1)
+
+    return scored
+
+
+def score_file(
+    input_path: str,
+    output_path: str,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    threshold: float = DEFAULT_THRESHOLD,
+    top_k: int = 0,
+    variant: str = "full",
+) -> int:
+    """
+    Score `input_path` into `output_path`. Returns the number of rows scored.
+    """
+    input_path, output_path = Path(input_path), Path(output_path)
+    chunks = read_chunks(input_path, chunk_size)
+    writer = ChunkWriter(output_path)
+    n_rows = 0
+
+    try:
+        if workers <= 1:
+            _init_worker(threshold, top_k, num_threads=0, variant=variant)
+            for chunk in chunks:
+                scored = _score_chunk(chunk)
+                writer.write(scored)
+                n_rows += len(scored)
+            return n_rows
+
+        # Load once here so forked workers share the model pages
+        from inference.model_bundle import preload_for_fork
+
+        preload_for_fork(include_explainer=top_k > 0)
+        context = mp.get_context("fork" if os.name == "posix" else "spawn")
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(threshold, top_k, 1, variant),
+        ) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(_score_chunk, chunk))
+
+                # Bounded in-flight window; drain strictly in input order
+                if len(pending) >= 2 * workers:
+                    scored = pending.popleft().result()
+                    writer.write(scored)
+                    n_rows += len(scored)
+
+            while pending:
+                scored = pending.popleft().result()
+                writer.write(scored)
+                n_rows += len(scored)
+    finally:
+        writer.close()
+
+    return n_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk credit risk scoring")
+    parser.add_argument("input", help="Applicant CSV or Parquet file")
+    parser.add_argument("output", help="Output CSV or Parquet file")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument(
+        "--top-k", type=int, default=0,
+        help="Number of SHAP factors per applicant (0 disables explanations)",
+    )
+    parser.add_argument(
+        "--variant", default="full",
+        help="full, trees:N, float32 or cascade[:slack] (inference/model_variants.py)",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    n_rows = score_file(
+        args.input,
+        args.output,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        threshold=args.threshold,
+        top_k=args.top_k,
+        variant=args.variant,
+    )
+    elapsed = time.perf_counter() - start
+
+    print(f"Scored {n_rows} rows in {elapsed:.1f}s ({n_rows / elapsed:,.0f} rows/s)")
+    print(f"Results saved at: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
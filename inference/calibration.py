@@ -0,0 +1,56 @@
+"""
+Calibration Lookup Table
+Explainable Credit Default Prediction System
+
+Maps raw LightGBM probabilities to calibrated probabilities of default
+(PDs) with a monotone piecewise-linear table. The table is fitted at
+training time (training/calibration.py) and logged to the model's run as
+`calibration.json`; at inference it costs one `np.searchsorted` plus a
+multiply-add per row.
+"""
+
+from typing import Dict
+
+import numpy as np
+
+# Configuration
+CALIBRATION_ARTIFACT = "calibration.json"
+
+
+class CalibrationTable:
+    def __init__(self, x, y, method: str = "isotonic"):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+
+        if x.ndim != 1 or x.shape != y.shape or len(x) < 2:
+            raise ValueError("Calibration table needs matching 1-D knots (>= 2)")
+        if np.any(np.diff(x) < 0):
+            raise ValueError("Calibration knots must be sorted")
+
+        self.method = method
+        self.x = x
+        # Enforce monotonicity so ranking (and decisions) are preserved
+        self.y = np.clip(np.maximum.accumulate(y), 0.0, 1.0)
+
+        dx = np.diff(self.x)
+        dy = np.diff(self.y)
+        self._slope = np.divide(dy, dx, out=np.zeros_like(dy), where=dx > 0)
+
+    def apply(self, probs) -> np.ndarray:
+        p = np.clip(np.asarray(probs, dtype=np.float64), self.x[0], self.x[-1])
+
+        idx = np.searchsorted(self.x, p, side="right") - 1
+        idx = np.clip(idx, 0, len(self._slope) - 1)
+
+        return self.y[idx] + self._slope[idx] * (p - self.x[idx])
+
+    def to_dict(self) -> Dict:
+        return {
+            "method": self.method,
+            "x": self.x.tolist(),
+            "y": self.y.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CalibrationTable":
+        return cls(data["x"], data["y"], method=data.get("method", "isotonic"))
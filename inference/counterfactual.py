@@ -0,0 +1,227 @@
+"""
+Counterfactual Search
+Explainable Credit Default Prediction System
+
+Finds the smallest change to actionable features that moves an applicant's
+default probability below the decision threshold.
+
+- Candidate values are precomputed from the booster's split thresholds:
+  a tree ensemble's output only changes when a feature crosses a split,
+  so one value per threshold interval covers every distinct outcome
+- Each feature only moves in its risk-reducing direction (e.g. pay more,
+  owe less, fewer months of delay), which prunes the other half
+- All candidates for an applicant are scored in one batched model call
+"""
+
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+# Configuration
+# prefix -> (risk-reducing direction, lowest suggestable value)
+ACTIONABLE_FEATURES = {
+    "pay_amt": (+1, 0.0),
+    "bill_amt": (-1, 0.0),
+    "limit_bal": (+1, 0.0),
+    "repayment_status_": (-1, -1.0),  # -1 = paid duly
+}
+MAX_CANDIDATES_PER_FEATURE = 40
+MAX_STEPS = 3
+MAX_OPTIONS = 3
+
+
+class CounterfactualSearch:
+    def __init__(
+        self,
+        booster,
+        features: List[str],
+        threshold: float,
+        max_candidates_per_feature: int = MAX_CANDIDATES_PER_FEATURE,
+        max_steps: int = MAX_STEPS,
+        predict_fn: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+    ):
+        """
+        `predict_fn` scores candidate rows (default: `booster.predict`).
+        Pass the served scoring path when it differs from the full booster
+        (model variants), so counterfactuals cross the served decision.
+        """
+        if list(booster.feature_name()) != list(features):
+            raise ValueError("Booster feature order does not match the feature schema")
+
+        self.booster = booster
+        self.predict_fn = predict_fn or booster.predict
+        self.features = list(features)
+        self.threshold = threshold
+        self.max_candidates_per_feature = max_candidates_per_feature
+        self.max_steps = max_steps
+
+        thresholds = self._split_thresholds(booster)
+
+        # (feature index, direction, floor, split thresholds, cost scale)
+        self._actionable = []
+        for i, name in enumerate(self.features):
+            rule = self._rule_for(name)
+            if rule is None or i not in thresholds:
+                continue
+
+            direction, floor = rule
+            t = thresholds[i]
+            q1, q3 = np.percentile(t, [25, 75])
+            scale = max(float(q3 - q1), 1.0)
+            self._actionable.append((i, direction, floor, t, scale))
+
+    # Precomputation
+    @staticmethod
+    def _rule_for(name: str):
+        for prefix, rule in ACTIONABLE_FEATURES.items():
+            if name.startswith(prefix):
+                return rule
+        return None
+
+    @staticmethod
+    def _split_thresholds(booster) -> Dict[int, np.ndarray]:
+        collected = defaultdict(list)
+        stack = [t["tree_structure"] for t in booster.dump_model()["tree_info"]]
+
+        while stack:
+            node = stack.pop()
+            if "split_feature" in node:
+                collected[node["split_feature"]].append(node["threshold"])
+                stack.append(node["left_child"])
+                stack.append(node["right_child"])
+
+        return {f: np.unique(np.asarray(v, dtype=float)) for f, v in collected.items()}
+
+    # Candidate Generation
+    def _candidate_values(self, x: float, direction: int, floor: float, t: np.ndarray):
+        # LightGBM sends `x <= t` left; values are integral (amounts, codes)
+        if direction > 0:
+            values = np.floor(t[t >= x]) + 1
+        else:
+            values = np.floor(t[t < x])
+            values = values[values >= floor]
+
+        values = np.unique(values)
+        nearest = np.argsort(np.abs(values - x), kind="stable")
+        return values[nearest[: self.max_candidates_per_feature]]
+
+    def _perturbations(self, current: np.ndarray, changed: set):
+        feat_idx, values, scales = [], [], []
+
+        for i, direction, floor, t, scale in self._actionable:
+            if i in changed:
+                continue
+            v = self._candidate_values(current[i], direction, floor, t)
+            feat_idx.append(np.full(len(v), i))
+            values.append(v)
+            scales.append(np.full(len(v), scale))
+
+        if not feat_idx:
+            return None
+
+        feat_idx = np.concatenate(feat_idx)
+        values = np.concatenate(values)
+        scales = np.concatenate(scales)
+
+        rows = np.repeat(current[None, :], len(values), axis=0)
+        rows[np.arange(len(values)), feat_idx] = values
+        return rows, feat_idx, values, scales
+
+    # Search
+    def search(self, x: np.ndarray, max_options: int = MAX_OPTIONS) -> List[Dict]:
+        """
+        Return up to `max_options` counterfactuals for one applicant (feature
+        vector in schema order), cheapest first. Each option lists the
+        changes to make and the resulting default probability. Applicants
+        already below the threshold get an empty list.
+
+        Single-feature changes are tried first; if none crosses the
+        threshold, the most effective change per unit of cost is kept and
+        the search repeats from there (up to `max_steps` changes).
+        """
+        current = np.asarray(x, dtype=float).copy()
+        prob = float(self.predict_fn(current[None, :])[0])
+        if prob < self.threshold:
+            return []
+
+        steps, changed, base_cost = [], set(), 0.0
+
+        for _ in range(self.max_steps):
+            batch = self._perturbations(current, changed)
+            if batch is None:
+                break
+
+            rows, feat_idx, values, scales = batch
+            probs = self.predict_fn(rows)
+            costs = np.abs(values - current[feat_idx]) / scales
+
+            crossing = np.flatnonzero(probs < self.threshold)
+            if len(crossing):
+                return self._options(
+                    crossing, probs, costs, feat_idx, values,
+                    current, steps, base_cost, max_options,
+                )
+
+            gain = (prob - probs) / np.maximum(costs, 1e-9)
+            best = int(np.argmax(gain))
+            if gain[best] <= 0:
+                break
+
+            i = int(feat_idx[best])
+            steps.append(self._change(i, current[i], values[best]))
+            changed.add(i)
+            base_cost += float(costs[best])
+            current[i] = values[best]
+            prob = float(probs[best])
+
+        return []
+
+    def _options(
+        self, crossing, probs, costs, feat_idx, values,
+        current, steps, base_cost, max_options,
+    ) -> List[Dict]:
+        # Cheapest crossing change per feature
+        options, seen = [], set()
+        for j in crossing[np.argsort(costs[crossing], kind="stable")]:
+            i = int(feat_idx[j])
+            if i in seen:
+                continue
+            seen.add(i)
+
+            options.append({
+                "changes": steps + [self._change(i, current[i], values[j])],
+                "default_probability": round(float(probs[j]), 4),
+                "cost": round(base_cost + float(costs[j]), 4),
+            })
+            if len(options) >= max_options:
+                break
+
+        return options
+
+    def _change(self, i: int, current_value: float, suggested_value: float) -> Dict:
+        return {
+            "feature": self.features[i],
+            "current_value": float(current_value),
+            "suggested_value": float(suggested_value),
+        }
+
+
+def describe(option: Dict, current_probability: Optional[float] = None) -> str:
+    """
+    Human-readable sentence for one counterfactual option.
+    """
+    parts = []
+    for c in option["changes"]:
+        verb = "Increase" if c["suggested_value"] > c["current_value"] else "Reduce"
+        parts.append(
+            f"{verb} {c['feature']} from {c['current_value']:,.0f} "
+            f"to {c['suggested_value']:,.0f}"
+        )
+
+    outcome = f"default probability {option['default_probability']:.2f}"
+    if current_probability is not None:
+        outcome = f"default probability {current_probability:.2f} -> " \
+                  f"{option['default_probability']:.2f}"
+
+    return f"{' and '.join(parts)} ({outcome})"
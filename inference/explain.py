@@ -4,11 +4,11 @@ SHAP-based local explanations + counterfactuals
 """
 
 
-import shap
+import numpy as np
 import pandas as pd
 from typing import Dict, List
-import mlflow.lightgbm
-from inference.predictor import CreditRiskPredictor, MODEL_URI
+from inference.counterfactual import CounterfactualSearch, describe
+from inference.predictor import CreditRiskPredictor
 
 
 
@@ -17,16 +17,26 @@ class CreditRiskExplainer:
         self.predictor = predictor
         self.features = predictor.features
 
-        # Load the underlying LightGBM model directly for SHAP
+        # Reuse the predictor's LightGBM model (no second load per worker)
         try:
-            lgbm_model = mlflow.lightgbm.load_model(MODEL_URI)
+            self.explainer = predictor.bundle.tree_explainer()
         except Exception as e:
-            raise TypeError(f"Failed to load LightGBM model for SHAP: {e}")
-
-        self.explainer = shap.TreeExplainer(lgbm_model)
+            raise TypeError(f"Failed to build SHAP explainer: {e}")
+
+        # Split thresholds are precomputed here, once per explainer.
+        # Candidates are scored on the served path (model variant, if any),
+        # so suggestions cross the decision actually made; SHAP factors are
+        # always computed on the full model
+        self.counterfactual_search = CounterfactualSearch(
+            predictor.bundle.booster,
+            self.features,
+            predictor.threshold,
+            predict_fn=predictor.predict_proba_matrix,
+        )
 
     def explain(self, input_data: Dict, top_k: int = 5) -> Dict:
-        X = pd.DataFrame([input_data])[self.features]
+        X = self.predictor.schema.decode(input_data)
+        prob = self.predictor.predict_proba_matrix(X)[0]
 
         shap_values = self.explainer.shap_values(X)
 
@@ -51,27 +61,36 @@ class CreditRiskExplainer:
             for f, v in feature_imp[:top_k]
         ]
 
+        counterfactuals = self._counterfactuals(X)
+
         return {
             "top_contributing_factors": top_features,
-            "counterfactual_suggestions": self._counterfactuals(top_features),
+            "counterfactual_suggestions": [
+                describe(option, prob) for option in counterfactuals
+            ],
+            "counterfactuals": counterfactuals,
         }
 
-    def _counterfactuals(self, top_features: List[Dict]) -> List[str]:
-        suggestions = []
-
-        for item in top_features:
-            if item["direction"] == "increases_risk":
-                f = item["feature"]
-
-                if "bill_amt" in f:
-                    suggestions.append("Reduce outstanding bill amounts")
-                elif "pay_amt" in f:
-                    suggestions.append("Increase recent repayment amounts")
-                elif "repayment_status" in f:
-                    suggestions.append("Avoid payment delays")
-                elif f == "limit_bal":
-                    suggestions.append("Maintain higher available credit limit")
-                elif f == "age":
-                    suggestions.append("Longer credit history improves risk profile")
-
-        return list(set(suggestions))
\ No newline at end of file
+    def top_factors_batch(self, X: pd.DataFrame, top_k: int = 5) -> pd.DataFrame:
+        """
+        Top-k SHAP factors for every row of X, as flat columns
+        (factor_1_feature, factor_1_impact, ...).
+        """
+        shap_values = self.explainer.shap_values(X[self.features])
+
+        if isinstance(shap_values, list):
+            shap_values = shap_values[1]
+
+        order = np.argsort(-np.abs(shap_values), axis=1)[:, :top_k]
+        impacts = np.take_along_axis(shap_values, order, axis=1)
+        names = np.asarray(self.features)[order]
+
+        columns = {}
+        for k in range(order.shape[1]):
+            columns[f"factor_{k + 1}_feature"] = names[:, k]
+            columns[f"factor_{k + 1}_impact"] = np.round(impacts[:, k], 4)
+
+        return pd.DataFrame(columns)
+
+    def _counterfactuals(self, X: np.ndarray) -> List[Dict]:
+        return self.counterfactual_search.search(X[0])
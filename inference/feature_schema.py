@@ -0,0 +1,193 @@
+"""
+Feature Schema
+Explainable Credit Default Prediction System
+
+The single feature contract shared by training and serving: model input
+order, dtypes, valid ranges for the coded fields, and the columns that are
+never model inputs (`id`, `default`). Everything else is generated from it:
+
+- `select()`          training / batch column selection
+- `decode()`          dict -> float64 row, via one precompiled itemgetter
+- `validate()`        vectorized range and integer-code checks
+- `request_model()`   the Pydantic request model used by the API
+
+Training logs the schema to the model's run as `feature_schema.json`.
+Models registered before that are served through `from_feature_list()`,
+which rebuilds a schema from the run's `features` param as-is (including
+`id` if the model was trained on it).
+"""
+
+from dataclasses import asdict, dataclass
+from operator import itemgetter
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Configuration
+SCHEMA_ARTIFACT = "feature_schema.json"
+ID_COL = "id"
+TARGET_COL = "default"
+REPAYMENT_MONTHS = ("sep", "aug", "jul", "jun", "may", "apr")
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    name: str
+    dtype: str = "float"            # "int" (coded) or "float" (amount)
+    ge: Optional[float] = None
+    le: Optional[float] = None
+    description: Optional[str] = None
+
+
+class FeatureSchema:
+    def __init__(self, specs: List[FeatureSpec], excluded: List[str] = (ID_COL, TARGET_COL)):
+        self.specs = list(specs)
+        self.excluded = [c for c in excluded if c not in {s.name for s in self.specs}]
+        self.features = [s.name for s in self.specs]
+        self.index = {name: j for j, name in enumerate(self.features)}
+
+        # Compiled once: per-request decoding is a single C-level lookup
+        self._getter = itemgetter(*self.features)
+
+        self._lower = np.array(
+            [-np.inf if s.ge is None else s.ge for s in self.specs], dtype=np.float64
+        )
+        self._upper = np.array(
+            [np.inf if s.le is None else s.le for s in self.specs], dtype=np.float64
+        )
+        self._integer = np.array([s.dtype == "int" for s in self.specs])
+
+    # Training / Batch
+    def select(self, df):
+        """
+        Model input columns of `df`, in model order. Extra columns (id,
+        target, anything else) are dropped.
+        """
+        missing = [f for f in self.features if f not in df.columns]
+        if missing:
+            raise ValueError(f"Missing required features: {missing}")
+
+        return df[self.features]
+
+    # Serving
+    def decode(self, record: Dict) -> np.ndarray:
+        """
+        One applicant dict -> float64 array of shape (1, n_features).
+        Extra keys are ignored.
+        """
+        try:
+            values = self._getter(record)
+        except KeyError:
+            missing = [f for f in self.features if f not in record]
+            raise ValueError(f"Missing required features: {missing}")
+
+        try:
+            return np.array(values, dtype=np.float64, ndmin=2)
+        except (TypeError, ValueError):
+            raise ValueError("Feature values must be numeric")
+
+    def decode_many(self, records: List[Dict]) -> np.ndarray:
+        if not records:
+            return np.empty((0, len(self.features)), dtype=np.float64)
+
+        try:
+            rows = [self._getter(r) for r in records]
+        except KeyError:
+            missing = sorted({f for r in records for f in self.features if f not in r})
+            raise ValueError(f"Missing required features: {missing}")
+
+        try:
+            return np.array(rows, dtype=np.float64, ndmin=2)
+        except (TypeError, ValueError):
+            raise ValueError("Feature values must be numeric")
+
+    def validate(self, X: np.ndarray) -> np.ndarray:
+        """
+        Raise ValueError if any value is outside its feature's range or a
+        coded feature is not a whole number. NaN is passed through
+        (LightGBM treats it as missing).
+        """
+        if X.ndim != 2 or X.shape[1] != len(self.features):
+            raise ValueError(
+                f"Expected a matrix with {len(self.features)} feature columns"
+            )
+
+        with np.errstate(invalid="ignore"):
+            invalid = (X < self._lower) | (X > self._upper)
+            invalid |= self._integer & (X != np.floor(X)) & ~np.isnan(X)
+
+        if invalid.any():
+            j = int(np.argmax(invalid.any(axis=0)))
+            spec = self.specs[j]
+            raise ValueError(
+                f"Invalid values for '{spec.name}' in {int(invalid[:, j].sum())} "
+                f"row(s): expected {spec.dtype} in [{spec.ge}, {spec.le}]"
+            )
+
+        return X
+
+    def request_model(self, name: str = "CreditRequest"):
+        """
+        Pydantic request model: every feature required, coded features as
+        strict ints, plus an optional (non-input) customer `id`.
+        """
+        from pydantic import Field, create_model
+
+        fields = {ID_COL: (Optional[int], Field(None, description="Customer ID"))}
+        for spec in self.specs:
+            if spec.dtype == "int":
+                annotation, strict = int, True
+            else:
+                annotation, strict = float, False
+            fields[spec.name] = (annotation, Field(
+                ..., ge=spec.ge, le=spec.le, strict=strict,
+                description=spec.description,
+            ))
+
+        return create_model(name, **fields)
+
+    # Persistence
+    def to_dict(self) -> Dict:
+        return {
+            "features": [asdict(s) for s in self.specs],
+            "excluded": self.excluded,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "FeatureSchema":
+        return cls(
+            [FeatureSpec(**s) for s in data["features"]],
+            excluded=data.get("excluded", (ID_COL, TARGET_COL)),
+        )
+
+    @classmethod
+    def from_feature_list(cls, features: List[str]) -> "FeatureSchema":
+        """
+        Schema for a model that only logged its `features` param. Known
+        features keep their specs; anything else (e.g. `id` on older
+        models) is an unbounded float.
+        """
+        known = {s.name: s for s in CREDIT_SCHEMA.specs}
+        return cls([known.get(f, FeatureSpec(f)) for f in features])
+
+
+# Credit Default Schema (UCI "default of credit card clients" coding)
+CREDIT_SCHEMA = FeatureSchema(
+    [
+        FeatureSpec("limit_bal", "float", ge=0, description="Credit limit"),
+        FeatureSpec("gender", "int", 1, 2, "1=Male, 2=Female"),
+        FeatureSpec("education", "int", 0, 6,
+                    "1=Graduate school, 2=University, 3=High school, 0/4-6=Other"),
+        FeatureSpec("marital_status", "int", 0, 3, "1=Married, 2=Single, 0/3=Other"),
+        FeatureSpec("age", "int", 18, 100),
+    ]
+    + [
+        FeatureSpec(f"repayment_status_{m}", "int", -2, 9,
+                    "-2/-1=Paid duly, 0=Revolving, 1-9=Months delayed")
+        for m in REPAYMENT_MONTHS
+    ]
+    + [FeatureSpec(f"bill_amt{i}", "float", description="Bill statement amount")
+       for i in range(1, 7)]
+    + [FeatureSpec(f"pay_amt{i}", "float", ge=0, description="Previous payment amount")
+       for i in range(1, 7)]
+)
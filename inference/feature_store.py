@@ -0,0 +1,201 @@
+"""
+Applicant Feature Store
+Explainable Credit Default Prediction System
+
+Indexed local store of the latest known features per applicant `id`, so a
+request can carry only an id (plus any overrides) and have the remaining
+fields (bill / pay / repayment history etc.) filled in server-side.
+
+- SQLite table keyed on `id INTEGER PRIMARY KEY` (the rowid B-tree)
+- Built from processed CSV extracts; later extracts replace earlier rows
+- In-memory LRU for hot ids, chunked `IN (...)` queries for bulk lookups
+
+Usage:
+    python -m inference.feature_store data/processed/credit_data.csv \\
+        [later_extract.csv ...] --db data/feature_store.sqlite
+"""
+
+import argparse
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+# Configuration
+DB_PATH = Path("data/feature_store.sqlite")
+TABLE = "applicants"
+ID_COL = "id"
+EXCLUDED_COLUMNS = {"default"}   # target is never served
+CHUNK_SIZE = 100_000
+CACHE_SIZE = 100_000
+MAX_SQL_VARIABLES = 900
+
+
+# Build
+def build_store(
+    csv_paths: Iterable[str],
+    db_path: Path = DB_PATH,
+    chunk_size: int = CHUNK_SIZE,
+) -> int:
+    """
+    Load one or more processed extracts into the store. Returns the number
+    of rows written (replaced rows are counted again).
+    """
+    def frames():
+        for path in csv_paths:
+            print(f"Loading {path}...")
+            yield from pd.read_csv(path, chunksize=chunk_size)
+
+    n_rows = build_store_from_frames(frames(), db_path)
+    print(f"Feature store saved at: {db_path} ({n_rows} rows written)")
+    return n_rows
+
+
+def build_store_from_frames(frames: Iterable[pd.DataFrame], db_path: Path = DB_PATH) -> int:
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+
+    columns, n_rows = None, 0
+    try:
+        for chunk in frames:
+            chunk = chunk.drop(columns=[c for c in EXCLUDED_COLUMNS if c in chunk])
+            if ID_COL not in chunk.columns:
+                raise ValueError(f"Extract has no '{ID_COL}' column")
+
+            if columns is None:
+                columns = [ID_COL] + [c for c in chunk.columns if c != ID_COL]
+                _create_table(conn, chunk[columns])
+
+            missing = set(columns) - set(chunk.columns)
+            if missing:
+                raise ValueError(f"Extract is missing columns: {missing}")
+
+            placeholders = ",".join("?" * len(columns))
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {TABLE} ({','.join(columns)}) "
+                f"VALUES ({placeholders})",
+                chunk[columns].itertuples(index=False, name=None),
+            )
+            conn.commit()
+            n_rows += len(chunk)
+    finally:
+        conn.close()
+
+    return n_rows
+
+
+def _create_table(conn: sqlite3.Connection, sample: pd.DataFrame):
+    def sql_type(dtype) -> str:
+        return "INTEGER" if pd.api.types.is_integer_dtype(dtype) else "REAL"
+
+    definitions = [f"{ID_COL} INTEGER PRIMARY KEY"] + [
+        f"{c} {sql_type(sample[c].dtype)}" for c in sample.columns if c != ID_COL
+    ]
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {TABLE} ({', '.join(definitions)})")
+
+
+# Lookup
+class FeatureStore:
+    def __init__(self, db_path: Path = DB_PATH, cache_size: int = CACHE_SIZE):
+        self.db_path = Path(db_path)
+        if not self.db_path.exists():
+            raise FileNotFoundError(f"Feature store not found at {self.db_path}")
+
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+
+        self._cache: "OrderedDict[int, Dict]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._local = threading.local()
+
+        cursor = self._conn().execute(f"SELECT * FROM {TABLE} LIMIT 0")
+        self.columns = [d[0] for d in cursor.description]
+
+    def _conn(self) -> sqlite3.Connection:
+        # One read-only connection per thread (FastAPI runs sync routes in a pool)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False
+            )
+            self._local.conn = conn
+        return conn
+
+    def _cache_get(self, applicant_id: int) -> Optional[Dict]:
+        with self._cache_lock:
+            row = self._cache.get(applicant_id)
+            if row is not None:
+                self._cache.move_to_end(applicant_id)
+                self.hits += 1
+            return row
+
+    def _cache_put(self, rows: Dict[int, Dict]):
+        with self._cache_lock:
+            for applicant_id, row in rows.items():
+                self._cache[applicant_id] = row
+                self._cache.move_to_end(applicant_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def get(self, applicant_id: int) -> Optional[Dict]:
+        return self.get_many([applicant_id]).get(applicant_id)
+
+    def get_many(self, applicant_ids: List[int]) -> Dict[int, Dict]:
+        """
+        Stored features for each known id (unknown ids are absent).
+        """
+        found, missing = {}, []
+        for applicant_id in dict.fromkeys(int(i) for i in applicant_ids):
+            row = self._cache_get(applicant_id) if self.cache_size else None
+            if row is not None:
+                found[applicant_id] = row
+            else:
+                missing.append(applicant_id)
+
+        self.misses += len(missing)
+        loaded = {}
+        conn = self._conn()
+        for start in range(0, len(missing), MAX_SQL_VARIABLES):
+            batch = missing[start:start + MAX_SQL_VARIABLES]
+            cursor = conn.execute(
+                f"SELECT * FROM {TABLE} WHERE {ID_COL} IN "
+                f"({','.join('?' * len(batch))})",
+                batch,
+            )
+            for values in cursor:
+                loaded[values[0]] = dict(zip(self.columns, values))
+
+        if self.cache_size:
+            self._cache_put(loaded)
+
+        found.update(loaded)
+        return found
+
+    def stats(self) -> Dict:
+        return {
+            "cached": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the applicant feature store")
+    parser.add_argument("csv", nargs="+", help="Processed extracts, oldest first")
+    parser.add_argument("--db", default=str(DB_PATH))
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    build_store(args.csv, Path(args.db), args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Model Bundle
+Explainable Credit Default Prediction System
+
+Holds everything a serving process needs for one registered model version:
+the native LightGBM model, its feature schema, calibration table and (on
+demand) the SHAP
+TreeExplainer. Bundles are cached per process, so loading one in a
+pre-fork parent (e.g. gunicorn `preload_app`) lets every worker share the
+same read-only pages instead of loading its own copy.
+"""
+
+import gc
+import threading
+from typing import Dict, Optional, Set
+
+import numpy as np
+
+from inference.feature_schema import ID_COL, SCHEMA_ARTIFACT, FeatureSchema
+
+# Configuration
+MODEL_NAME = "CreditRiskLightGBM"
+MODEL_URI = f"models:/{MODEL_NAME}/latest"
+
+_BUNDLES: Dict[str, "ModelBundle"] = {}
+_BUNDLES_LOCK = threading.Lock()
+
+
+class ModelBundle:
+    def __init__(self, model_name: str = MODEL_NAME, version: Optional[str] = None):
+        self.model_name = model_name
+        self.version, self.run_id = self._resolve_version(version)
+        self.model_uri = f"models:/{model_name}/{self.version}"
+        self._artifacts = self._list_artifacts()
+        self.schema = self._load_schema()
+        self.features = self.schema.features
+        self.model = self._load_model()
+        self.calibration = self._load_calibration()
+
+        self._tree_explainer = None
+        self._explainer_lock = threading.Lock()
+
+    # Model Loading
+    def _resolve_version(self, version: Optional[str]):
+        from mlflow.tracking import MlflowClient
+
+        client = MlflowClient()
+        if version is not None:
+            mv = client.get_model_version(self.model_name, str(version))
+            return str(mv.version), mv.run_id
+
+        versions = client.get_latest_versions(self.model_name)
+        if not versions:
+            raise RuntimeError("No registered model versions found")
+
+        return str(versions[0].version), versions[0].run_id
+
+    def _list_artifacts(self) -> Set[str]:
+        from mlflow.tracking import MlflowClient
+
+        return {a.path for a in MlflowClient().list_artifacts(self.run_id)}
+
+    def _load_schema(self) -> FeatureSchema:
+        from mlflow.artifacts import load_dict
+        from mlflow.tracking import MlflowClient
+
+        if SCHEMA_ARTIFACT in self._artifacts:
+            return FeatureSchema.from_dict(
+                load_dict(f"runs:/{self.run_id}/{SCHEMA_ARTIFACT}")
+            )
+
+        # Older runs only logged the ordered feature list
+        run = MlflowClient().get_run(self.run_id)
+        features = run.data.params.get("features")
+        if features is None:
+            raise RuntimeError("Feature schema missing in MLflow params")
+
+        schema = FeatureSchema.from_feature_list(features.split(","))
+        if ID_COL in schema.features:
+            print(f" Warning: {self.model_uri} was trained with '{ID_COL}' as an input")
+        return schema
+
+    def _load_model(self):
+        import mlflow.lightgbm
+        from mlflow.models import get_model_info
+
+        print(f" Loading model from MLflow: {self.model_uri}")
+
+        # Native LightGBM model: one copy serves both scoring and SHAP
+        if "lightgbm" in get_model_info(self.model_uri).flavors:
+            self.flavor = "lightgbm"
+            return mlflow.lightgbm.load_model(self.model_uri)
+
+        # Other registered models (e.g. the fairness-mitigated challenger)
+        # are scored through pyfunc; their output is the default probability
+        self.flavor = "pyfunc"
+        return mlflow.pyfunc.load_model(self.model_uri)
+
+    def _load_calibration(self):
+        from mlflow.artifacts import load_dict
+
+        from inference.calibration import CALIBRATION_ARTIFACT, CalibrationTable
+
+        # Models trained before calibration was added have no table
+        if CALIBRATION_ARTIFACT not in self._artifacts:
+            return None
+
+        return CalibrationTable.from_dict(
+            load_dict(f"runs:/{self.run_id}/{CALIBRATION_ARTIFACT}")
+        )
+
+    @property
+    def booster(self):
+        if self.flavor != "lightgbm":
+            raise TypeError(f"{self.model_uri} is not a LightGBM model")
+        return self.model.booster_
+
+    # Prediction
+    def predict_proba(self, X, num_threads: int = 0) -> np.ndarray:
+        """
+        Default probabilities for a DataFrame already in `self.features` order.
+        """
+        if self.flavor == "lightgbm":
+            return self.model.predict_proba(X, num_threads=num_threads)[:, 1]
+
+        return np.asarray(self.model.predict(X), dtype=float).ravel()
+
+    # Explainability
+    def tree_explainer(self):
+        if self._tree_explainer is None:
+            with self._explainer_lock:
+                if self._tree_explainer is None:
+                    import shap
+
+                    self._tree_explainer = shap.TreeExplainer(self.model)
+
+        return self._tree_explainer
+
+
+def get_model_bundle(
+    model_name: str = MODEL_NAME, version: Optional[str] = None
+) -> ModelBundle:
+    """
+    Return the process-wide bundle for `model_name` (latest version unless
+    `version` is given), loading it on first use.
+    """
+    key = f"{model_name}@{version or 'latest'}"
+    bundle = _BUNDLES.get(key)
+    if bundle is not None:
+        return bundle
+
+    with _BUNDLES_LOCK:
+        if key not in _BUNDLES:
+            _BUNDLES[key] = ModelBundle(model_name, version)
+
+    return _BUNDLES[key]
+
+
+def preload_for_fork(
+    model_name: str = MODEL_NAME,
+    include_explainer: bool = True,
+) -> ModelBundle:
+    """
+    Load the bundle in a parent process before workers are forked.
+
+    After loading, surviving objects are moved to the GC's permanent
+    generation so collections in the workers do not write to (and thereby
+    copy) the pages that hold the shared model.
+    """
+    bundle = get_model_bundle(model_name)
+    if include_explainer:
+        bundle.tree_explainer()
+
+    gc.collect()
+    gc.freeze()
+    return bundle
@@ -0,0 +1,357 @@
+"""
+Model Variants
+Explainable Credit Default Prediction System
+
+Lighter ways to evaluate the deployed LightGBM booster, selected by a
+variant spec (`CREDIT_API_MODEL_VARIANT`, `--variant`):
+
+    full            native LightGBM, all trees, float64 (default)
+    trees:N         native LightGBM, first N trees only (`num_iteration`)
+    float32         trees compiled to numpy arrays with float32 thresholds
+                    and leaf values, evaluated for all trees at once
+    cascade[:S]     native LightGBM in blocks of trees; a row stops once its
+                    partial margin is further from the threshold than the
+                    remaining trees could move it (suffix sums of their
+                    min / max leaf values), scaled by slack S (default 1.0)
+
+`cascade:1` never changes a decision, but probabilities of rows that exit
+early are the partial-margin estimate. With S < 1 rows exit sooner at the
+risk of decision flips. `python -m inference.model_variants` reports AUC
+change, decision flip rate and latency for each variant on the held-out
+test split.
+
+When serving a variant, the predictor drops `calibrated_pd` (the table is
+fitted on full-model scores) and the explainer searches counterfactuals
+on the variant. SHAP factors still describe the full model.
+"""
+
+import argparse
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Configuration
+CASCADE_BLOCK = 50            # trees per cascade stage
+COMPILED_BATCH = 4_096        # rows per float32 evaluation batch
+ZERO_THRESHOLD = 1e-35        # LightGBM's kZeroThreshold
+REPORT_VARIANTS = [
+    "full", "trees:200", "trees:150", "trees:100", "float32",
+    "cascade:1", "cascade:0.1", "cascade:0.05",
+]
+
+
+def _sigmoid_scale(booster) -> float:
+    objective = booster.dump_model()["objective"]
+    if not objective.startswith("binary"):
+        raise ValueError(f"Variants need a binary objective, got '{objective}'")
+    for token in objective.split():
+        if token.startswith("sigmoid:"):
+            return float(token.split(":", 1)[1])
+    return 1.0
+
+
+# Variants
+class FullModel:
+    def __init__(self, booster):
+        self.name = "full"
+        self.booster = booster
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.booster.predict(X)
+
+
+class TruncatedModel:
+    def __init__(self, booster, n_trees: int):
+        total = booster.current_iteration()
+        if not 0 < n_trees <= total:
+            raise ValueError(f"trees:N needs 1 <= N <= {total}")
+        self.name = f"trees:{n_trees}"
+        self.booster = booster
+        self.n_trees = n_trees
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.booster.predict(X, num_iteration=self.n_trees)
+
+
+class CompiledTrees:
+    """
+    The ensemble flattened into padded (trees x nodes) arrays. Every row
+    walks every tree at once: one gather / compare / select per tree level
+    instead of per node.
+    """
+
+    def __init__(self, booster, dtype=np.float32):
+        self.name = "float32" if dtype == np.float32 else "compiled"
+        self.dtype = dtype
+        self.scale = _sigmoid_scale(booster)
+
+        trees = [self._flatten(t["tree_structure"]) for t in booster.dump_model()["tree_info"]]
+        n_trees = len(trees)
+        max_nodes = max(1, max(len(t["feature"]) for t in trees))
+        max_leaves = max(len(t["leaf_value"]) for t in trees)
+
+        self.root = np.array([t["root"] for t in trees], dtype=np.int32)
+        self.feature = np.zeros((n_trees, max_nodes), dtype=np.int32)
+        self.threshold = np.zeros((n_trees, max_nodes), dtype=dtype)
+        self.left = np.full((n_trees, max_nodes), -1, dtype=np.int32)
+        self.right = np.full((n_trees, max_nodes), -1, dtype=np.int32)
+        self.default_left = np.zeros((n_trees, max_nodes), dtype=bool)
+        self.missing_nan = np.zeros((n_trees, max_nodes), dtype=bool)
+        self.missing_zero = np.zeros((n_trees, max_nodes), dtype=bool)
+        self.leaf_value = np.zeros((n_trees, max_leaves), dtype=dtype)
+
+        for i, t in enumerate(trees):
+            k = len(t["feature"])
+            self.feature[i, :k] = t["feature"]
+            self.threshold[i, :k] = t["threshold"]
+            self.left[i, :k] = t["left"]
+            self.right[i, :k] = t["right"]
+            self.default_left[i, :k] = t["default_left"]
+            self.missing_nan[i, :k] = [m == "NaN" for m in t["missing_type"]]
+            self.missing_zero[i, :k] = [m == "Zero" for m in t["missing_type"]]
+            self.leaf_value[i, :len(t["leaf_value"])] = t["leaf_value"]
+
+        self.depth = max(t["depth"] for t in trees)
+        self._has_zero_missing = bool(self.missing_zero.any())
+
+        # Flat views for 1-D `take` gathers
+        self._node_offset = (np.arange(n_trees) * max_nodes)[None, :]
+        self._leaf_offset = (np.arange(n_trees) * max_leaves)[None, :]
+        for name in ("feature", "threshold", "left", "right", "default_left",
+                     "missing_nan", "missing_zero", "leaf_value"):
+            setattr(self, f"_{name}", getattr(self, name).ravel())
+
+    @staticmethod
+    def _flatten(root: Dict) -> Dict:
+        # Internal nodes get indices >= 0, leaves are stored as ~leaf_index
+        tree = {k: [] for k in ("feature", "threshold", "left", "right",
+                                "default_left", "missing_type", "leaf_value")}
+        depth = 0
+
+        def visit(node: Dict, level: int) -> int:
+            nonlocal depth
+            if "leaf_value" in node:
+                depth = max(depth, level)
+                tree["leaf_value"].append(node["leaf_value"])
+                return ~(len(tree["leaf_value"]) - 1)
+
+            if node["decision_type"] != "<=":
+                raise ValueError("Categorical splits are not supported")
+
+            idx = len(tree["feature"])
+            tree["feature"].append(node["split_feature"])
+            tree["threshold"].append(node["threshold"])
+            tree["default_left"].append(node["default_left"])
+            tree["missing_type"].append(node["missing_type"])
+            tree["left"].append(0)
+            tree["right"].append(0)
+            tree["left"][idx] = visit(node["left_child"], level + 1)
+            tree["right"][idx] = visit(node["right_child"], level + 1)
+            return idx
+
+        tree["root"] = visit(root, 0)
+        tree["depth"] = depth
+        return tree
+
+    def raw_score(self, X: np.ndarray) -> np.ndarray:
+        if len(X) > COMPILED_BATCH:
+            return np.concatenate([
+                self.raw_score(X[i:i + COMPILED_BATCH])
+                for i in range(0, len(X), COMPILED_BATCH)
+            ])
+
+        X = np.ascontiguousarray(X, dtype=self.dtype)
+        has_nan = bool(np.isnan(X).any())
+        row_offset = (np.arange(len(X)) * X.shape[1])[:, None]
+        flat_X = X.ravel()
+
+        # Per-tree node ids; adding the tree's offset indexes the flat arrays
+        node = np.broadcast_to(self.root, (len(X), len(self.root))).copy()
+        for _ in range(self.depth):
+            active = node >= 0
+            if not active.any():
+                break
+            nd = np.where(active, node, 0) + self._node_offset
+
+            x = flat_X.take(row_offset + self._feature.take(nd))
+            threshold = self._threshold.take(nd)
+            if has_nan or self._has_zero_missing:
+                nan = np.isnan(x)
+                missing_nan = self._missing_nan.take(nd)
+                x = np.where(nan & ~missing_nan, 0, x)
+                go_left = x <= threshold
+                default = (nan & missing_nan) | (
+                    self._missing_zero.take(nd) & (np.abs(x) <= ZERO_THRESHOLD)
+                )
+                go_left = np.where(default, self._default_left.take(nd), go_left)
+            else:
+                go_left = x <= threshold
+
+            child = np.where(go_left, self._left.take(nd), self._right.take(nd))
+            node = np.where(active, child, node)
+
+        leaf = ~node + self._leaf_offset
+        return self._leaf_value.take(leaf).sum(axis=1, dtype=np.float64)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return 1.0 / (1.0 + np.exp(-self.scale * self.raw_score(X)))
+
+
+class CascadeModel:
+    def __init__(self, booster, threshold: float, slack: float = 1.0,
+                 block: int = CASCADE_BLOCK):
+        if not 0 < threshold < 1:
+            raise ValueError("Cascade threshold must be in (0, 1)")
+        if slack < 0:
+            raise ValueError("Cascade slack must be >= 0")
+
+        self.name = f"cascade:{slack:g}"
+        self.booster = booster
+        self.slack = slack
+        self.block = block
+        self.scale = _sigmoid_scale(booster)
+        self.cut = np.log(threshold / (1 - threshold)) / self.scale
+        self.n_trees = booster.current_iteration()
+
+        # Largest possible rise / fall of the margin from trees >= i
+        leaves = [self._leaf_range(t["tree_structure"]) for t in booster.dump_model()["tree_info"]]
+        lo = np.array([l for l, _ in leaves])
+        hi = np.array([h for _, h in leaves])
+        self.rest_max = np.r_[np.cumsum(hi[::-1])[::-1], 0.0]
+        self.rest_min = np.r_[np.cumsum(lo[::-1])[::-1], 0.0]
+
+    @staticmethod
+    def _leaf_range(node: Dict):
+        stack, values = [node], []
+        while stack:
+            n = stack.pop()
+            if "leaf_value" in n:
+                values.append(n["leaf_value"])
+            else:
+                stack.extend((n["left_child"], n["right_child"]))
+        return min(values), max(values)
+
+    def predict_with_trees(self, X: np.ndarray):
+        """
+        Probabilities and the number of trees evaluated per row.
+        """
+        margin = np.zeros(len(X))
+        trees_used = np.zeros(len(X), dtype=np.int32)
+        active = np.arange(len(X))
+
+        for start in range(0, self.n_trees, self.block):
+            end = min(start + self.block, self.n_trees)
+            margin[active] += self.booster.predict(
+                X[active], start_iteration=start, num_iteration=end - start, raw_score=True
+            )
+            trees_used[active] = end
+
+            m = margin[active]
+            decided = (m + self.slack * self.rest_min[end] > self.cut) | (
+                m + self.slack * self.rest_max[end] < self.cut
+            )
+            active = active[~decided]
+            if not len(active):
+                break
+
+        return 1.0 / (1.0 + np.exp(-self.scale * margin)), trees_used
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.predict_with_trees(X)[0]
+
+
+def build_variant(booster, spec: Optional[str], threshold: float):
+    """
+    Variant for a spec string ("full", "trees:150", "float32", "cascade:0.5").
+    """
+    kind, _, arg = (spec or "full").strip().lower().partition(":")
+
+    if kind == "full":
+        return FullModel(booster)
+    if kind == "trees":
+        return TruncatedModel(booster, int(arg))
+    if kind == "float32":
+        return CompiledTrees(booster, np.float32)
+    if kind == "cascade":
+        return CascadeModel(booster, threshold, float(arg) if arg else 1.0)
+
+    raise ValueError(
+        f"Unknown model variant '{spec}', expected full, trees:N, float32 or cascade[:slack]"
+    )
+
+
+# Report
+def _latency(fn, X: np.ndarray, single_rows: int = 500) -> Dict:
+    fn(X[:1])
+    samples = []
+    for i in range(min(single_rows, len(X))):
+        start = time.perf_counter()
+        fn(X[i:i + 1])
+        samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    fn(X)
+    batch_s = time.perf_counter() - start
+
+    return {
+        "single_p50_us": round(float(np.percentile(samples, 50)) * 1e6, 1),
+        "batch_rows_per_s": int(len(X) / batch_s),
+    }
+
+
+def compare_variants(booster, X: np.ndarray, y: np.ndarray, threshold: float,
+                     specs: List[str] = REPORT_VARIANTS) -> List[Dict]:
+    from sklearn.metrics import roc_auc_score
+
+    reference = booster.predict(X)
+    reference_auc = roc_auc_score(y, reference)
+    reference_decision = reference >= threshold
+
+    rows = []
+    for spec in specs:
+        variant = build_variant(booster, spec, threshold)
+        probs = variant.predict(X)
+
+        row = {
+            "variant": variant.name,
+            "auc": round(float(roc_auc_score(y, probs)), 4),
+            "auc_change": round(float(roc_auc_score(y, probs) - reference_auc), 4),
+            "flip_rate": round(float(np.mean((probs >= threshold) != reference_decision)), 4),
+            "max_abs_prob_diff": round(float(np.abs(probs - reference).max()), 4),
+            **_latency(variant.predict, X),
+        }
+        if isinstance(variant, CascadeModel):
+            row["mean_trees"] = round(float(variant.predict_with_trees(X)[1].mean()), 1)
+        rows.append(row)
+
+    return rows
+
+
+def main():
+    import pandas as pd
+
+    from inference.model_bundle import MODEL_NAME, get_model_bundle
+    from training.train import DATA_PATH, load_data, split_data
+
+    parser = argparse.ArgumentParser(description="Accuracy / latency report for model variants")
+    parser.add_argument("--model-name", default=MODEL_NAME)
+    parser.add_argument("--version", default=None)
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--threshold", type=float, default=0.4)
+    parser.add_argument("--variants", nargs="+", default=REPORT_VARIANTS)
+    args = parser.parse_args()
+
+    bundle = get_model_bundle(args.model_name, args.version)
+    df = load_data(args.data)
+    _, X_test, _, y_test = split_data(df)
+    # Select from the source rows: a model trained with `id` needs it back
+    X = bundle.schema.select(df.loc[X_test.index]).to_numpy(dtype=np.float64)
+
+    print(f"{bundle.model_uri}: {len(X)} held-out rows, threshold {args.threshold}")
+    report = compare_variants(bundle.booster, X, y_test.to_numpy(), args.threshold, args.variants)
+    print(pd.DataFrame(report).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,63 +3,117 @@ Inference Module
 Explainable Credit Default Prediction System
 """
 
-import mlflow
+import numpy as np
 import pandas as pd
-from typing import Dict, List
-from mlflow.tracking import MlflowClient
+from typing import Dict, List, Optional, Tuple
+
+from inference.model_bundle import (
+    MODEL_NAME,
+    ModelBundle,
+    get_model_bundle,
+)
 
 # Configuration
-MODEL_NAME = "CreditRiskLightGBM"
-MODEL_URI = f"models:/{MODEL_NAME}/latest"
 DEFAULT_THRESHOLD = 0.5
 
 
 class CreditRiskPredictor:
-    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        bundle: Optional[ModelBundle] = None,
+        variant: Optional[str] = None,
+    ):
         self.threshold = threshold
-        self.model = self._load_model()
-        self.features = self._load_features()
+        # Shared per process (and across pre-forked workers)
+        self.bundle = bundle or get_model_bundle(MODEL_NAME)
+        self.model = self.bundle.model
+        # Feature order, dtypes and ranges the model was trained with
+        self.schema = self.bundle.schema
+        self.features = self.schema.features
+        # Raw score -> calibrated PD lookup table (None for older models)
+        self.calibration = self.bundle.calibration
+        # Lighter scoring path (inference/model_variants.py); explanations
+        # always use the full booster
+        self.variant_name = (variant or "full").strip().lower()
+        self.variant = self._build_variant(self.variant_name)
+        if self.variant is not None:
+            # The table maps full-model scores; applied to variant scores it
+            # would report a PD that no fitted calibration supports
+            self.calibration = None
 
-    # Model Loading
-    def _load_model(self):
-        print(f" Loading model from MLflow: {MODEL_URI}")
-        return mlflow.pyfunc.load_model(MODEL_URI)
+    def _build_variant(self, spec: str):
+        if spec == "full":
+            return None
+        if self.bundle.flavor != "lightgbm":
+            raise ValueError(f"Model variant '{spec}' needs a native LightGBM model")
 
-    def _load_features(self) -> List[str]:
-        client = MlflowClient()
+        from inference.model_variants import build_variant
 
-        versions = client.get_latest_versions(MODEL_NAME)
-        if not versions:
-            raise RuntimeError("No registered model versions found")
+        return build_variant(self.bundle.booster, spec, self.threshold)
 
-        run_id = versions[0].run_id
-        run = client.get_run(run_id)
+    # Prediction
+    def _prepare_input(self, input_data: Dict) -> np.ndarray:
+        # Extra fields not used by the model (e.g. id) are ignored
+        return self.schema.decode(input_data)
 
-        features = run.data.params.get("features")
-        if features is None:
-            raise RuntimeError("Feature schema missing in MLflow params")
+    def predict_proba_batch(self, df: pd.DataFrame, num_threads: int = 0) -> np.ndarray:
+        """
+        Vectorized default probabilities for a frame of applicants.
+        Extra columns are ignored; `num_threads=0` lets LightGBM use all cores.
+        """
+        X = self.schema.select(df).to_numpy(dtype=np.float64)
+        return self.predict_proba_matrix(X, num_threads=num_threads)
 
-        return features.split(",")
+    def predict_proba_matrix(self, X: np.ndarray, num_threads: int = 0) -> np.ndarray:
+        """
+        Probabilities for a float matrix already in `self.features` order.
+        Skips DataFrame construction entirely (columnar wire formats).
+        """
+        self.schema.validate(X)
 
-    # Prediction
-    def _prepare_input(self, input_data: Dict) -> pd.DataFrame:
-        df = pd.DataFrame([input_data])
-        # Drop any extra fields not used by the model (e.g., id)
-        df = df[[c for c in df.columns if c in self.features]]
-        missing = set(self.features) - set(df.columns)
-        if missing:
-            raise ValueError(f"Missing required features: {missing}")
+        if self.bundle.flavor != "lightgbm":
+            return self.bundle.predict_proba(pd.DataFrame(X, columns=self.features))
+        if self.variant is not None:
+            return self.variant.predict(X)
+
+        return self.bundle.booster.predict(X, num_threads=num_threads)
+
+    def decide_batch(self, probs: np.ndarray) -> pd.DataFrame:
+        high_risk = probs >= self.threshold
 
-        return df[self.features]
+        decisions = pd.DataFrame({
+            "default_probability": np.round(probs, 4),
+            "risk_label": np.where(high_risk, "HIGH_RISK", "LOW_RISK"),
+            "decision": np.where(high_risk, "REJECTED", "APPROVED"),
+        })
+        if self.calibration is not None:
+            decisions["calibrated_pd"] = np.round(self.calibration.apply(probs), 4)
+
+        return decisions
+
+    def predict_batch(self, records: List[Dict]) -> List[Dict]:
+        probs = self.predict_proba_matrix(self.schema.decode_many(records))
+        return self.decide_batch(probs).to_dict("records")
 
     def predict(self, input_data: Dict) -> Dict:
+        return self.predict_with_probability(input_data)[0]
+
+    def predict_with_probability(self, input_data: Dict) -> Tuple[Dict, float]:
+        """
+        The rounded prediction and the unrounded probability it came from.
+        """
         X = self._prepare_input(input_data)
 
-        prob = float(self.model.predict(X)[0])
+        prob = float(self.predict_proba_matrix(X)[0])
         decision = "APPROVED" if prob < self.threshold else "REJECTED"
 
-        return {
+        prediction = {
             "default_probability": round(prob, 4),
             "risk_label": "HIGH_RISK" if prob >= self.threshold else "LOW_RISK",
             "decision": decision,
         }
+        if self.calibration is not None:
+            prediction["calibrated_pd"] = round(float(self.calibration.apply(prob)), 4)
+
+        return prediction, prob
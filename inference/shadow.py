@@ -0,0 +1,233 @@
+"""
+Shadow (Champion / Challenger) Scoring
+Explainable Credit Default Prediction System
+
+The champion answers every request. A sampled fraction of requests is also
+handed to a background thread, which scores them with each challenger in
+batches and writes champion and challenger outputs to the decision log as
+one record. The request thread only does a non-blocking queue put.
+
+Agreement rate, probability deltas and challenger latency are aggregated
+in-process and exposed through `ShadowScorer.stats()`.
+"""
+
+import queue
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from inference.model_bundle import get_model_bundle
+from inference.predictor import CreditRiskPredictor
+
+# Configuration
+BATCH_SIZE = 256
+MAX_BATCH_WAIT_S = 0.05
+QUEUE_SIZE = 10_000
+LATENCY_WINDOW = 1_000
+
+
+def parse_challengers(spec: str) -> List[tuple]:
+    """
+    "CreditRiskLightGBM_Fair,CreditRiskLightGBM@3" ->
+    [("CreditRiskLightGBM_Fair", None), ("CreditRiskLightGBM", "3")]
+    """
+    challengers = []
+    for item in filter(None, (s.strip() for s in spec.split(","))):
+        name, _, version = item.partition("@")
+        challengers.append((name, version or None))
+    return challengers
+
+
+def load_challengers(spec: str, threshold: float) -> Dict[str, CreditRiskPredictor]:
+    challengers = {}
+    for name, version in parse_challengers(spec):
+        bundle = get_model_bundle(name, version)
+        challengers[f"{name}@{bundle.version}"] = CreditRiskPredictor(
+            threshold=threshold, bundle=bundle
+        )
+    return challengers
+
+
+class _ChallengerStats:
+    def __init__(self):
+        self.n = 0
+        self.agreements = 0
+        self.delta_sum = 0.0
+        self.abs_delta_sum = 0.0
+        self.max_abs_delta = 0.0
+        self.errors = 0
+        self.latency_ms_per_row = deque(maxlen=LATENCY_WINDOW)
+
+    def update(self, champion: np.ndarray, challenger: np.ndarray,
+               threshold: float, latency_ms: float):
+        delta = challenger - champion
+        agree = (champion >= threshold) == (challenger >= threshold)
+
+        self.n += len(delta)
+        self.agreements += int(agree.sum())
+        self.delta_sum += float(delta.sum())
+        self.abs_delta_sum += float(np.abs(delta).sum())
+        self.max_abs_delta = max(self.max_abs_delta, float(np.abs(delta).max()))
+        self.latency_ms_per_row.append(latency_ms / len(delta))
+
+    def summary(self) -> Dict:
+        latency = np.asarray(self.latency_ms_per_row)
+        return {
+            "scored": self.n,
+            "errors": self.errors,
+            "agreement_rate": self.agreements / self.n if self.n else None,
+            "mean_delta": self.delta_sum / self.n if self.n else None,
+            "mean_abs_delta": self.abs_delta_sum / self.n if self.n else None,
+            "max_abs_delta": self.max_abs_delta,
+            "latency_ms_per_row_p50": float(np.percentile(latency, 50)) if len(latency) else None,
+            "latency_ms_per_row_p95": float(np.percentile(latency, 95)) if len(latency) else None,
+        }
+
+
+class ShadowScorer:
+    def __init__(
+        self,
+        champion: CreditRiskPredictor,
+        challengers: Dict[str, CreditRiskPredictor],
+        decision_logger=None,
+        sample_rate: float = 1.0,
+        batch_size: int = BATCH_SIZE,
+    ):
+        self.champion = champion
+        self.challengers = challengers
+        self.decision_logger = decision_logger
+        self.sample_rate = sample_rate
+        self.batch_size = batch_size
+
+        self.submitted = 0
+        self.dropped = 0
+        self.failed = 0
+        self._champion_latency_ms = deque(maxlen=LATENCY_WINDOW)
+        self._stats = {name: _ChallengerStats() for name in challengers}
+        self._stats_lock = threading.Lock()
+
+        self._queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self._thread = threading.Thread(
+            target=self._run, name="shadow-scorer", daemon=True
+        )
+        self._thread.start()
+
+    def add_challenger(self, name: str, challenger: CreditRiskPredictor):
+        with self._stats_lock:
+            self._stats[name] = _ChallengerStats()
+            self.challengers = {**self.challengers, name: challenger}
+
+    # Request Path
+    def submit(self, features: Dict, champion_output: Dict,
+               champion_latency_ms: float, champion_probability: Optional[float] = None):
+        """
+        Record one champion decision. Sampled requests are queued for the
+        challengers; the rest go straight to the decision log. O(1), never
+        blocks. Deltas are measured against `champion_probability` (the
+        unrounded score) when given, else the output's rounded probability.
+        """
+        self._champion_latency_ms.append(champion_latency_ms)
+
+        record = {
+            "model": {
+                "name": self.champion.bundle.model_name,
+                "version": self.champion.bundle.version,
+            },
+            "features": features,
+            "champion": {**champion_output, "latency_ms": champion_latency_ms},
+        }
+
+        if not self.challengers or random.random() >= self.sample_rate:
+            if self.decision_logger:
+                self.decision_logger.log(record)
+            return
+
+        if champion_probability is None:
+            champion_probability = champion_output["default_probability"]
+
+        try:
+            self._queue.put_nowait((record, champion_probability))
+            self.submitted += 1
+        except queue.Full:
+            self.dropped += 1
+            if self.decision_logger:
+                self.decision_logger.log(record)
+
+    # Background Scoring
+    def _next_batch(self) -> List[Dict]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + MAX_BATCH_WAIT_S
+
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            # A failing batch must not stop the thread, or every later
+            # sample would silently pile up as dropped
+            try:
+                self._score_batch(batch)
+            except Exception as e:
+                self.failed += len(batch)
+                print(f"Shadow scoring failed for a batch of {len(batch)}: {e}")
+
+    def _score_batch(self, items: List[tuple]):
+        batch = [record for record, _ in items]
+        frame = pd.DataFrame([r["features"] for r in batch])
+        champion_probs = np.array([prob for _, prob in items], dtype=np.float64)
+
+        for name, challenger in list(self.challengers.items()):
+            start = time.perf_counter()
+            try:
+                probs = challenger.predict_proba_batch(frame)
+                latency_ms = (time.perf_counter() - start) * 1000
+                decisions = challenger.decide_batch(probs).to_dict("records")
+            except Exception:
+                with self._stats_lock:
+                    self._stats[name].errors += len(batch)
+                continue
+
+            with self._stats_lock:
+                self._stats[name].update(
+                    champion_probs, probs, self.champion.threshold, latency_ms
+                )
+
+            for record, decision in zip(batch, decisions):
+                record.setdefault("challengers", {})[name] = decision
+
+        if self.decision_logger:
+            for record in batch:
+                self.decision_logger.log(record)
+
+    # Reporting
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            challengers = {
+                name: stats.summary() for name, stats in self._stats.items()
+            }
+
+        champion_latency = np.asarray(self._champion_latency_ms)
+        return {
+            "sample_rate": self.sample_rate,
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "pending": self._queue.qsize(),
+            "champion_latency_ms_p50": float(np.percentile(champion_latency, 50)) if len(champion_latency) else None,
+            "champion_latency_ms_p95": float(np.percentile(champion_latency, 95)) if len(champion_latency) else None,
+            "challengers": challengers,
+        }
@@ -1 +1,87 @@
-"""Bias drift monitoring over time."""
+"""
+Bias Drift Monitoring
+Explainable Credit Default Prediction System
+
+Production decisions carry no outcome labels, so drift is tracked on the
+demographic parity gap: the spread of rejection rates across the groups
+of each sensitive attribute (gender, age group) in a window of logged
+decisions, compared with the same gap on the reference data.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+# Configuration
+AGE_BINS = [30, 50]                 # young <= 30 < middle <= 50 < senior
+AGE_LABELS = ["young", "middle", "senior"]
+GENDER_LABELS = {1: "male", 2: "female"}
+MIN_GROUP_SIZE = 50                 # smaller groups are too noisy to compare
+MAX_PARITY_GAP = 0.10               # absolute gap that counts as a breach
+MAX_GAP_INCREASE = 0.05             # increase over the reference gap
+
+
+def sensitive_groups(frame) -> Dict[str, np.ndarray]:
+    """
+    Group label per row for each sensitive attribute. `frame` needs the
+    `gender` and `age` feature columns.
+    """
+    age = np.asarray(frame["age"], dtype=np.float64)
+    gender = np.asarray(frame["gender"]).astype(int)
+
+    return {
+        "gender": np.array([GENDER_LABELS.get(g, "other") for g in gender]),
+        "age_group": np.asarray(AGE_LABELS)[np.digitize(age, AGE_BINS, right=True)],
+    }
+
+
+def parity_gaps(frame, rejected: np.ndarray, min_group_size: int = MIN_GROUP_SIZE) -> Dict:
+    """
+    Rejection rate per group and the max - min gap per attribute. Groups
+    below `min_group_size` rows are reported but not used for the gap.
+    """
+    rejected = np.asarray(rejected, dtype=np.float64)
+    results = {}
+
+    for attribute, labels in sensitive_groups(frame).items():
+        names, codes = np.unique(labels, return_inverse=True)
+        counts = np.bincount(codes, minlength=len(names))
+        rates = np.bincount(codes, weights=rejected, minlength=len(names)) / np.maximum(counts, 1)
+
+        eligible = counts >= min_group_size
+        gap = float(rates[eligible].max() - rates[eligible].min()) if eligible.sum() >= 2 else None
+
+        results[attribute] = {
+            "gap": gap,
+            "groups": {
+                str(name): {"count": int(n), "rejection_rate": float(r)}
+                for name, n, r in zip(names, counts, rates)
+            },
+        }
+
+    return results
+
+
+def bias_drift(current: Dict, reference: Optional[Dict] = None) -> Dict:
+    """
+    Compare window gaps with reference gaps. An attribute breaches when its
+    gap exceeds MAX_PARITY_GAP or grew by more than MAX_GAP_INCREASE.
+    """
+    results = {}
+    for attribute, window in current.items():
+        gap = window["gap"]
+        ref_gap = (reference or {}).get(attribute, {}).get("gap")
+
+        increase = gap - ref_gap if gap is not None and ref_gap is not None else None
+        breached = gap is not None and (
+            gap > MAX_PARITY_GAP or (increase is not None and increase > MAX_GAP_INCREASE)
+        )
+
+        results[attribute] = {
+            "gap": gap,
+            "reference_gap": ref_gap,
+            "increase": increase,
+            "breached": bool(breached),
+        }
+
+    return results
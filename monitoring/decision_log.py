@@ -0,0 +1,137 @@
+"""
+Decision Log
+Explainable Credit Default Prediction System
+
+Append-only JSON-lines log of served credit decisions, one file per UTC day
+and writing process:
+
+    logs/decisions/decisions-YYYY-MM-DD-<pid>.jsonl
+
+Each gunicorn worker appends only to its own file, so buffered writes from
+different processes never interleave within a line.
+
+Records are queued by the request thread and written by a background
+thread, so logging never blocks a response. Monitoring jobs read the log
+back as DataFrames with `read_decisions`.
+"""
+
+import json
+import os
+import queue
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Configuration
+LOG_DIR = Path("logs/decisions")
+QUEUE_SIZE = 100_000
+FLUSH_INTERVAL_S = 1.0
+
+
+def _log_file(log_dir: Path, day, pid: int) -> Path:
+    return log_dir / f"decisions-{day:%Y-%m-%d}-{pid}.jsonl"
+
+
+def _day_files(log_dir: Path, day) -> List[Path]:
+    # Per-process files, plus the single daily file older versions wrote
+    return sorted(log_dir.glob(f"decisions-{day:%Y-%m-%d}*.jsonl"))
+
+
+class DecisionLogger:
+    def __init__(self, log_dir: Path = LOG_DIR, queue_size: int = QUEUE_SIZE):
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.dropped = 0
+        self.failed = 0
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(
+            target=self._run, name="decision-log", daemon=True
+        )
+        self._thread.start()
+
+    def log(self, record: Dict):
+        """
+        Queue one decision record. Never blocks; drops (and counts) records
+        if the writer falls too far behind.
+        """
+        record.setdefault("ts", datetime.now(timezone.utc).isoformat())
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 5.0):
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        pid = os.getpid()
+        handle, handle_path = None, None
+        while True:
+            try:
+                record = self._queue.get(timeout=FLUSH_INTERVAL_S)
+            except queue.Empty:
+                if handle:
+                    try:
+                        handle.flush()
+                    except OSError as e:
+                        print(f"Decision log flush failed: {e}")
+                continue
+
+            if record is None:
+                break
+
+            # One bad record (unserializable field, malformed ts, I/O error)
+            # must not stop the writer, or every later decision is dropped
+            try:
+                line = json.dumps(record, default=float) + "\n"
+                path = _log_file(
+                    self.log_dir, datetime.fromisoformat(record["ts"]), pid
+                )
+                if path != handle_path:
+                    if handle:
+                        handle.close()
+                    # Never keep writing to a closed handle if the open fails
+                    handle, handle_path = None, None
+                    handle, handle_path = open(path, "a", encoding="utf-8"), path
+
+                handle.write(line)
+            except Exception as e:
+                self.failed += 1
+                print(f"Decision log write failed: {e}")
+
+        if handle:
+            handle.close()
+
+
+def read_decisions(
+    start: datetime,
+    end: Optional[datetime] = None,
+    log_dir: Path = LOG_DIR,
+):
+    """
+    Decisions logged in [start, end) as a DataFrame, one row per decision.
+    Nested fields are flattened (e.g. `features.limit_bal`,
+    `champion.default_probability`).
+    """
+    import pandas as pd
+
+    end = end or datetime.now(timezone.utc)
+    log_dir = Path(log_dir)
+
+    records = []
+    day = start.date()
+    while day <= end.date():
+        for path in _day_files(log_dir, day):
+            with open(path, encoding="utf-8") as f:
+                records.extend(json.loads(line) for line in f if line.strip())
+        day += timedelta(days=1)
+
+    if not records:
+        return pd.DataFrame()
+
+    df = pd.json_normalize(records)
+    ts = pd.to_datetime(df["ts"], utc=True)
+    return df[(ts >= start) & (ts < end)].reset_index(drop=True)
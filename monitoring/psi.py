@@ -1 +1,92 @@
-"""Population Stability Index calculation."""
+"""
+Population Stability Index (PSI)
+Explainable Credit Default Prediction System
+
+PSI = sum((actual% - expected%) * ln(actual% / expected%)) over bins fixed
+on a reference sample. Continuous features use reference quantile bins;
+coded features (few distinct values) get one bin per code.
+
+Rule of thumb: < 0.10 stable, 0.10-0.25 moderate shift, > 0.25 major shift.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Configuration
+N_BINS = 10
+MAX_CATEGORIES = 12     # at most this many distinct values -> one bin per value
+EPS = 1e-4              # floor on bin shares (empty bins would be infinite)
+PSI_MODERATE = 0.10
+PSI_MAJOR = 0.25
+
+
+def _bin_edges(reference: np.ndarray, n_bins: int = N_BINS) -> np.ndarray:
+    reference = reference[~np.isnan(reference)]
+    values = np.unique(reference)
+
+    if len(values) <= MAX_CATEGORIES:
+        # Midpoints between codes: every code gets its own bin
+        inner = (values[:-1] + values[1:]) / 2
+    else:
+        inner = np.unique(np.quantile(reference, np.linspace(0, 1, n_bins + 1)[1:-1]))
+
+    return np.concatenate([[-np.inf], inner, [np.inf]])
+
+
+def _shares(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    values = values[~np.isnan(values)]
+    counts = np.histogram(values, bins=edges)[0].astype(np.float64)
+    return np.maximum(counts / max(counts.sum(), 1.0), EPS)
+
+
+def psi(expected: np.ndarray, actual: np.ndarray, edges: Optional[np.ndarray] = None) -> float:
+    expected = np.asarray(expected, dtype=np.float64)
+    actual = np.asarray(actual, dtype=np.float64)
+    if edges is None:
+        edges = _bin_edges(expected)
+
+    e, a = _shares(expected, edges), _shares(actual, edges)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+class PSIReference:
+    """
+    Bin edges and expected shares fitted once on a reference sample (e.g.
+    the training data), so each monitoring window is a histogram per
+    column.
+    """
+
+    def __init__(self, edges: Dict[str, np.ndarray], expected: Dict[str, np.ndarray]):
+        self.edges = edges
+        self.expected = expected
+
+    @classmethod
+    def fit(cls, reference, columns: List[str], n_bins: int = N_BINS) -> "PSIReference":
+        edges, expected = {}, {}
+        for col in columns:
+            values = np.asarray(reference[col], dtype=np.float64)
+            edges[col] = _bin_edges(values, n_bins)
+            expected[col] = _shares(values, edges[col])
+        return cls(edges, expected)
+
+    def psi(self, current) -> Dict[str, float]:
+        """
+        PSI per reference column present in `current`.
+        """
+        results = {}
+        for col, edges in self.edges.items():
+            if col not in current:
+                continue
+            actual = _shares(np.asarray(current[col], dtype=np.float64), edges)
+            e = self.expected[col]
+            results[col] = float(np.sum((actual - e) * np.log(actual / e)))
+        return results
+
+
+def severity(value: float) -> str:
+    if value >= PSI_MAJOR:
+        return "major"
+    if value >= PSI_MODERATE:
+        return "moderate"
+    return "stable"
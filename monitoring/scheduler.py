@@ -0,0 +1,233 @@
+"""
+Drift Scheduler
+Explainable Credit Default Prediction System
+
+Local service that periodically checks the most recent window of logged
+production decisions (monitoring/decision_log.py) against the training
+data, and enqueues a retraining job (training/pipeline.py) when
+
+- any feature, or the champion's score, has PSI >= PSI_THRESHOLD, or
+- a sensitive attribute's rejection-rate gap breaches the fairness limits
+  (monitoring/bias_drift.py)
+
+The reference profile (PSI bins, reference scores and parity gaps) is
+built once per champion version. Jobs are deduplicated by the queue and
+rate-limited by a cooldown after the last finished retrain. Every check
+is appended to logs/drift/drift_checks.jsonl.
+
+The job trains on the newest processed extract (EXTRACT_GLOB). When that
+extract is the data the champion was trained on (same `dataset_key`), no
+job is enqueued: a retrain would only reproduce the champion. Refresh the
+extract first.
+
+Usage:
+    python -m monitoring.scheduler [--once] [--interval 3600] [--window-hours 24]
+    python -m training.pipeline worker   # runs the enqueued jobs
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from inference.feature_schema import CREDIT_SCHEMA
+from monitoring.bias_drift import bias_drift, parity_gaps
+from monitoring.decision_log import LOG_DIR, read_decisions
+from monitoring.psi import PSIReference
+from training.job_queue import JobQueue
+from training.pipeline import DATA_PATH, DECISION_THRESHOLD, JOB_KIND
+
+# Configuration
+CHECK_INTERVAL_S = 3600
+WINDOW_HOURS = 24
+MIN_WINDOW_ROWS = 500           # smaller windows are skipped, not judged
+PSI_THRESHOLD = 0.25
+COOLDOWN_HOURS = 24             # minimum time between finished retrains
+CHECK_LOG = Path("logs/drift/drift_checks.jsonl")
+SCORE_COL = "default_probability"
+EXTRACT_GLOB = "data/processed/credit_data*.csv"   # candidate training extracts
+
+
+class DriftScheduler:
+    def __init__(
+        self,
+        queue: JobQueue,
+        log_dir: Path = LOG_DIR,
+        reference_path: str = DATA_PATH,
+        window_hours: float = WINDOW_HOURS,
+        threshold: float = DECISION_THRESHOLD,
+    ):
+        self.queue = queue
+        self.log_dir = Path(log_dir)
+        self.reference_path = reference_path
+        self.window = timedelta(hours=window_hours)
+        self.threshold = threshold
+
+        self._reference = None
+        self._reference_version = None
+
+    # Reference Profile
+    def _load_reference(self, version: str) -> Dict:
+        import pandas as pd
+
+        from inference.model_bundle import MODEL_NAME, ModelBundle
+        from inference.predictor import CreditRiskPredictor
+
+        print(f"Building drift reference for {MODEL_NAME} v{version}...")
+        df = pd.read_csv(self.reference_path)
+        predictor = CreditRiskPredictor(
+            threshold=self.threshold, bundle=ModelBundle(MODEL_NAME, version)
+        )
+        probs = predictor.predict_proba_batch(df)
+
+        reference = df[CREDIT_SCHEMA.features].assign(**{SCORE_COL: probs})
+        return {
+            "psi": PSIReference.fit(reference, CREDIT_SCHEMA.features + [SCORE_COL]),
+            "parity": parity_gaps(df, probs >= self.threshold),
+        }
+
+    def reference(self, version: str) -> Dict:
+        if self._reference is None or self._reference_version != version:
+            self._reference = self._load_reference(version)
+            self._reference_version = version
+        return self._reference
+
+    # Checks
+    def check(self, end: Optional[datetime] = None) -> Dict:
+        end = end or datetime.now(timezone.utc)
+        start = end - self.window
+
+        window = read_decisions(start, end, self.log_dir)
+        report = {
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+            "window": {"start": start.isoformat(), "end": end.isoformat(), "rows": len(window)},
+            "breaches": [],
+        }
+        if len(window) < MIN_WINDOW_ROWS:
+            report["skipped"] = f"fewer than {MIN_WINDOW_ROWS} decisions in window"
+            return report
+
+        # Compare against the champion that made most of these decisions
+        version = str(window["model.version"].mode().iloc[0])
+        reference = self.reference(version)
+        report["model_version"] = version
+
+        current = window.filter(like="features.").rename(
+            columns=lambda c: c[len("features."):]
+        )
+        current[SCORE_COL] = window[f"champion.{SCORE_COL}"]
+        psi = reference["psi"].psi(current)
+        report["psi"] = {k: round(v, 4) for k, v in psi.items()}
+        report["breaches"] += [
+            f"psi:{col}" for col, value in psi.items() if value >= PSI_THRESHOLD
+        ]
+
+        rejected = (window["champion.decision"] == "REJECTED").to_numpy()
+        current_gaps = parity_gaps(current, rejected)
+        bias = bias_drift(current_gaps, reference["parity"])
+        report["bias"] = bias
+        report["breaches"] += [
+            f"bias:{attribute}" for attribute, result in bias.items() if result["breached"]
+        ]
+
+        return report
+
+    def run_once(self, end: Optional[datetime] = None) -> Optional[int]:
+        """
+        Run one check; returns the enqueued job id, if any.
+        """
+        report = self.check(end)
+        job_id = None
+
+        if report["breaches"]:
+            data_path = newest_extract()
+            if self._cooling_down():
+                report["action"] = "breach ignored (cooldown after last retrain)"
+            elif data_path is None:
+                report["action"] = f"breach not actionable: no extract matches {EXTRACT_GLOB}"
+            elif self._champion_trained_on(data_path):
+                report["action"] = (
+                    f"breach not actionable: {data_path} is the champion's training "
+                    f"data; refresh the extract to retrain"
+                )
+            else:
+                job_id = self.queue.enqueue(JOB_KIND, {
+                    "reason": "drift: " + ", ".join(report["breaches"]),
+                    "report": report,
+                    "options": {"data_path": data_path},
+                })
+                report["action"] = (
+                    f"enqueued job {job_id} on {data_path}" if job_id
+                    else "retrain already pending"
+                )
+
+        self._record(report)
+        print(f"Drift check [{report['window']['rows']} decisions]: "
+              f"{report.get('skipped') or report['breaches'] or 'no drift'}"
+              f"{' -> ' + report['action'] if 'action' in report else ''}")
+        return job_id
+
+    def run_forever(self, interval_s: float = CHECK_INTERVAL_S):
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Drift check failed: {e}")
+            time.sleep(interval_s)
+
+    @staticmethod
+    def _champion_trained_on(data_path: str) -> bool:
+        # Compared with the current champion, which a retrain would replace
+        from training.pipeline import champion_dataset_key
+        from training.train import dataset_key
+
+        return dataset_key(data_path) == champion_dataset_key()
+
+    def _cooling_down(self) -> bool:
+        last = self.queue.last_finished(JOB_KIND)
+        return bool(last) and time.time() - last["finished_at"] < COOLDOWN_HOURS * 3600
+
+    @staticmethod
+    def _record(report: Dict):
+        CHECK_LOG.parent.mkdir(parents=True, exist_ok=True)
+        with open(CHECK_LOG, "a", encoding="utf-8") as f:
+            f.write(json.dumps(report, default=_json_default) + "\n")
+
+
+def newest_extract(pattern: str = EXTRACT_GLOB) -> Optional[str]:
+    paths = glob.glob(pattern)
+    return max(paths, key=os.path.getmtime) if paths else None
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drift-triggered retraining scheduler")
+    parser.add_argument("--once", action="store_true", help="Run a single check and exit")
+    parser.add_argument("--interval", type=float, default=CHECK_INTERVAL_S)
+    parser.add_argument("--window-hours", type=float, default=WINDOW_HOURS)
+    parser.add_argument("--log-dir", default=str(LOG_DIR))
+    parser.add_argument("--queue", default=None)
+    args = parser.parse_args()
+
+    queue = JobQueue(args.queue) if args.queue else JobQueue()
+    scheduler = DriftScheduler(queue, Path(args.log_dir), window_hours=args.window_hours)
+
+    if args.once:
+        scheduler.run_once()
+    else:
+        scheduler.run_forever(args.interval)
+
+
+if __name__ == "__main__":
+    main()
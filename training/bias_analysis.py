@@ -1,6 +1,9 @@
 """
 Bias Analysis & Fairness Audit
 Explainable Credit Default Prediction System
+
+Fairlearn metrics for gender and age group. For every intersection of
+the sensitive attributes with bootstrap CIs, see training/fairness_audit.py.
 """
 
 import pandas as pd
@@ -74,6 +77,8 @@ def run_bias_audit():
     # STRICT FEATURE ALIGNMENT (CRITICAL) 
     X = df[feature_list]
     y_true = df[TARGET_COL]
+    # Score once; every attribute reuses the same predictions
+    y_pred = model.predict(X)
 
     print(" Running bias metrics...")
 
@@ -88,19 +93,19 @@ def run_bias_audit():
                 "tpr": true_positive_rate,
             },
             y_true=y_true,
-            y_pred=model.predict(X),
+            y_pred=y_pred,
             sensitive_features=df[col],
         )
 
         dp = demographic_parity_difference(
             y_true,
-            model.predict(X),
+            y_pred,
             sensitive_features=df[col],
         )
 
         eo = equalized_odds_difference(
             y_true,
-            model.predict(X),
+            y_pred,
             sensitive_features=df[col],
         )
 
@@ -18,6 +18,8 @@ from fairlearn.metrics import (
     equalized_odds_difference,
 )
 
+from inference.feature_schema import CREDIT_SCHEMA, SCHEMA_ARTIFACT
+
 # Configuration
 DATA_PATH = "data/processed/credit_data.csv"
 TARGET_COL = "default"
@@ -27,6 +29,20 @@ SENSITIVE_COL = "gender"   # primary protected attribute
 RANDOM_STATE = 42
 
 
+class FairModelWrapper(mlflow.pyfunc.PythonModel):
+    """
+    Serves the mitigated model through pyfunc. ExponentiatedGradient is a
+    randomized classifier, so `predict` returns its probability of default
+    rather than a sampled label (used for shadow scoring).
+    """
+
+    def __init__(self, mitigator):
+        self.mitigator = mitigator
+
+    def predict(self, context, model_input, params=None):
+        return self.mitigator._pmf_predict(model_input)[:, 1]
+
+
 # Utilities
 def load_data():
     df = pd.read_csv(DATA_PATH)
@@ -51,7 +67,7 @@ def run_bias_mitigation():
     print(" Loading data...")
     df = load_data()
 
-    X = df.drop(columns=[TARGET_COL])
+    X = CREDIT_SCHEMA.select(df)
     y = df[TARGET_COL]
     sensitive = df[SENSITIVE_COL]
 
@@ -139,6 +155,15 @@ def run_bias_mitigation():
             fair_fairness["eo_diff"],
         )
 
+        # Register the mitigated model so it can be shadow-scored
+        mlflow.log_dict(CREDIT_SCHEMA.to_dict(), SCHEMA_ARTIFACT)
+        mlflow.log_param("features", ",".join(X_train.columns))
+        mlflow.pyfunc.log_model(
+            artifact_path="model",
+            python_model=FairModelWrapper(mitigator),
+            registered_model_name=MODEL_NAME,
+        )
+
     print("\n Bias mitigation experiment complete.")
 
 
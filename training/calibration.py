@@ -0,0 +1,61 @@
+"""
+Probability Calibration
+Explainable Credit Default Prediction System
+
+Fits a calibrator (isotonic or Platt) on a held-out split and compiles it
+into a `CalibrationTable` (monotone piecewise-linear lookup) for serving.
+"""
+
+import numpy as np
+from sklearn.isotonic import IsotonicRegression
+from sklearn.linear_model import LogisticRegression
+
+from inference.calibration import CalibrationTable
+
+# Configuration
+CALIBRATION_METHODS = ("isotonic", "platt")
+PLATT_KNOTS = 257
+EPS = 1e-6
+
+
+def _logit(p: np.ndarray) -> np.ndarray:
+    p = np.clip(p, EPS, 1 - EPS)
+    return np.log(p / (1 - p))
+
+
+def fit_calibration_table(
+    y_true, y_prob, method: str = "isotonic"
+) -> CalibrationTable:
+    y_true = np.asarray(y_true, dtype=np.float64)
+    y_prob = np.asarray(y_prob, dtype=np.float64)
+
+    if method == "isotonic":
+        iso = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds="clip")
+        iso.fit(y_prob, y_true)
+        # Isotonic regression already is piecewise linear between these knots
+        x, y = iso.X_thresholds_, iso.y_thresholds_
+
+    elif method == "platt":
+        lr = LogisticRegression()
+        lr.fit(_logit(y_prob)[:, None], y_true)
+
+        # Knots at quantiles of the calibration scores, plus the end points
+        x = np.unique(np.concatenate([
+            [0.0, 1.0],
+            np.quantile(y_prob, np.linspace(0, 1, PLATT_KNOTS)),
+        ]))
+        y = lr.predict_proba(_logit(x)[:, None])[:, 1]
+
+    else:
+        raise ValueError(
+            f"Unknown calibration method '{method}', "
+            f"expected one of {CALIBRATION_METHODS}"
+        )
+
+    # Extend to [0, 1] so every raw probability falls inside the table
+    if x[0] > 0.0:
+        x, y = np.r_[0.0, x], np.r_[y[0], y]
+    if x[-1] < 1.0:
+        x, y = np.r_[x, 1.0], np.r_[y, y[-1]]
+
+    return CalibrationTable(x, y, method=method)
@@ -1 +1,90 @@
-"""Model evaluation and performance metrics."""
+"""
+Model Evaluation & Calibration Reliability
+Explainable Credit Default Prediction System
+
+- Reliability (calibration) report: observed default rate vs mean predicted
+  probability per bin, expected/maximum calibration error and Brier score
+- CLI evaluates the latest registered model on the training pipeline's
+  held-out test split, raw and calibrated
+"""
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+# Configuration
+DATA_PATH = "data/processed/credit_data.csv"
+N_BINS = 10
+
+
+def reliability_report(y_true, y_prob, n_bins: int = N_BINS) -> Dict:
+    """
+    Quantile-binned reliability table plus ECE, MCE and Brier score.
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    y_prob = np.asarray(y_prob, dtype=np.float64)
+
+    edges = np.unique(np.quantile(y_prob, np.linspace(0, 1, n_bins + 1)))
+    bins = np.clip(np.searchsorted(edges, y_prob, side="right") - 1, 0, len(edges) - 2)
+    n = len(edges) - 1
+
+    counts = np.bincount(bins, minlength=n)
+    mean_pred = np.bincount(bins, weights=y_prob, minlength=n) / np.maximum(counts, 1)
+    observed = np.bincount(bins, weights=y_true, minlength=n) / np.maximum(counts, 1)
+    gap = np.abs(observed - mean_pred)
+
+    return {
+        "n": int(len(y_true)),
+        "brier": float(np.mean((y_prob - y_true) ** 2)),
+        "ece": float(np.sum(counts * gap) / max(len(y_true), 1)),
+        "mce": float(gap[counts > 0].max()) if counts.any() else 0.0,
+        "bins": [
+            {
+                "lower": float(edges[i]),
+                "upper": float(edges[i + 1]),
+                "count": int(counts[i]),
+                "mean_predicted": float(mean_pred[i]),
+                "observed_rate": float(observed[i]),
+            }
+            for i in range(n)
+        ],
+    }
+
+
+def print_reliability_report(report: Dict, title: str = "Reliability"):
+    print(f"\n{title}: ECE={report['ece']:.4f}  MCE={report['mce']:.4f}  "
+          f"Brier={report['brier']:.4f}")
+    print(pd.DataFrame(report["bins"]).to_string(index=False, float_format="%.4f"))
+
+
+def evaluate_registered_model(data_path: str = DATA_PATH) -> Dict:
+    from sklearn.metrics import roc_auc_score
+
+    from inference.predictor import CreditRiskPredictor
+    from training.train import load_data, split_data
+
+    df = load_data(data_path)
+    _, X_test, _, y_test = split_data(df)
+    predictor = CreditRiskPredictor()
+    # The split holds current model inputs only; score the source rows so a
+    # model trained with `id` still gets it (selected by its own schema)
+    probs = predictor.predict_proba_batch(df.loc[X_test.index])
+
+    results = {
+        "roc_auc": float(roc_auc_score(y_test, probs)),
+        "raw": reliability_report(y_test, probs),
+    }
+    print(f"ROC-AUC: {results['roc_auc']:.4f}")
+    print_reliability_report(results["raw"], "Raw probabilities")
+
+    if predictor.calibration is not None:
+        calibrated = predictor.calibration.apply(probs)
+        results["calibrated"] = reliability_report(y_test, calibrated)
+        print_reliability_report(results["calibrated"], "Calibrated PD")
+
+    return results
+
+
+if __name__ == "__main__":
+    evaluate_registered_model()
@@ -0,0 +1,426 @@
+"""
+Intersectional Fairness Audit
+Explainable Credit Default Prediction System
+
+Audits the champion across every combination of the sensitive attributes
+(gender, age group, education, marital status: 15 slices from single
+attributes up to the full 4-way intersection) with bootstrap confidence
+intervals on the gaps.
+
+- The model scores the dataset once
+- Each attribute is encoded as integer codes, and every row gets one
+  joint cell index. A single `np.bincount` over (cell, y_true, y_pred)
+  gives the confusion counts of the full intersection. Every other slice
+  is a marginal sum of that tensor
+- Bootstrap: resampling the n rows with replacement and counting them
+  into those bins is a multinomial draw over the bins. Replicates are
+  drawn directly as count tensors, in blocks across a process pool, with
+  no per-row work
+- Per slice: demographic parity gap (max - min rejection rate) and
+  equalized odds gap (max of the TPR and FPR spreads) over groups with
+  enough rows, each with a basic bootstrap CI (widened where needed to
+  contain the observed gap) and a verdict against the limit: exceeds (CI
+  above), within (CI below) or inconclusive
+
+Writes a JSON report and refreshes the generated section of BIAS_AUDIT.md
+(between the fairness-audit markers).
+
+Usage:
+    python -m training.fairness_audit [--version 3] [--bootstrap 2000] [--workers 4]
+"""
+
+import argparse
+import json
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from inference.feature_schema import TARGET_COL
+from monitoring.bias_drift import AGE_BINS, AGE_LABELS, GENDER_LABELS, MAX_PARITY_GAP
+
+# Configuration
+DATA_PATH = "data/processed/credit_data.csv"
+REPORT_PATH = Path("governance/fairness_audit.json")
+MARKDOWN_PATH = Path("BIAS_AUDIT.md")
+MARKER_START = "<!-- fairness-audit:start -->"
+MARKER_END = "<!-- fairness-audit:end -->"
+
+DECISION_THRESHOLD = 0.4            # serving threshold (api/main.py)
+EDUCATION_LABELS = {1: "graduate", 2: "university", 3: "high_school", 4: "other"}
+MARITAL_LABELS = {1: "married", 2: "single", 3: "other"}
+UNKNOWN_LABEL = "unknown"           # undocumented codes (e.g. education 0, 5, 6)
+
+MIN_GROUP_SIZE = 50                 # groups used for the parity gap
+MIN_OUTCOME_COUNT = 10              # defaults and non-defaults needed for TPR / FPR
+MAX_ODDS_GAP = 0.10
+
+N_BOOTSTRAP = 2_000
+BOOTSTRAP_BLOCK = 250               # replicates per pool task
+CONFIDENCE = 0.95
+RANDOM_STATE = 42
+
+
+# Group Encoding
+def _encode(values: np.ndarray, labels: Dict[int, str]) -> Tuple[np.ndarray, List[str]]:
+    values = np.asarray(values).astype(np.int64)
+    names = list(labels.values())
+    codes = np.full(len(values), len(names), dtype=np.int64)
+
+    for code, value in enumerate(labels):
+        codes[values == value] = code
+    if (codes == len(names)).any():
+        names.append(UNKNOWN_LABEL)
+
+    return codes, names
+
+
+def encode_groups(df: pd.DataFrame) -> Dict[str, Tuple[np.ndarray, List[str]]]:
+    """
+    Integer group code per row and the code -> label list, per attribute.
+    """
+    age = df["age"].to_numpy(dtype=np.float64)
+
+    return {
+        "gender": _encode(df["gender"], GENDER_LABELS),
+        "age_group": (np.digitize(age, AGE_BINS, right=True), list(AGE_LABELS)),
+        "education": _encode(df["education"], EDUCATION_LABELS),
+        "marital_status": _encode(df["marital_status"], MARITAL_LABELS),
+    }
+
+
+def confusion_tensor(cells: np.ndarray, n_cells: int, y_true: np.ndarray,
+                     y_pred: np.ndarray) -> np.ndarray:
+    """
+    Counts per (joint cell, y_true, y_pred), from one bincount.
+    """
+    bins = cells * 4 + 2 * y_true.astype(np.int64) + y_pred.astype(np.int64)
+    return np.bincount(bins, minlength=n_cells * 4).reshape(n_cells, 2, 2)
+
+
+# Slice Metrics
+def _group_counts(counts: np.ndarray, keep: Tuple[int, ...], n_attributes: int) -> np.ndarray:
+    # counts: (..., *attribute_axes, 2, 2) -> (..., groups, 2, 2)
+    drop = tuple(i - n_attributes - 2 for i in range(n_attributes) if i not in keep)
+    grouped = counts.sum(axis=drop) if drop else counts
+    return grouped.reshape(grouped.shape[:-(len(keep) + 2)] + (-1, 2, 2))
+
+
+def _rates(counts: np.ndarray) -> Dict[str, np.ndarray]:
+    # counts[..., y_true, y_pred]; positive prediction = rejected
+    tn, fp = counts[..., 0, 0], counts[..., 0, 1]
+    fn, tp = counts[..., 1, 0], counts[..., 1, 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "count": tn + fp + fn + tp,
+            "rejection_rate": (fp + tp) / (tn + fp + fn + tp),
+            "tpr": tp / (tp + fn),
+            "fpr": fp / (fp + tn),
+        }
+
+
+def _spread(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    if mask.sum() < 2:
+        return np.full(values.shape[:-1], np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanmax(values[..., mask], axis=-1) - np.nanmin(values[..., mask], axis=-1)
+
+
+def _gaps(counts: np.ndarray, parity_mask: np.ndarray, odds_mask: np.ndarray) -> Tuple:
+    rates = _rates(counts)
+    parity = _spread(rates["rejection_rate"], parity_mask)
+    odds = np.fmax(_spread(rates["tpr"], odds_mask), _spread(rates["fpr"], odds_mask))
+    return parity, odds
+
+
+def _masks(counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Fixed on the observed data, so every replicate compares the same groups
+    n = counts.sum(axis=(-2, -1))
+    positives, negatives = counts[..., 1, :].sum(-1), counts[..., 0, :].sum(-1)
+    parity = n >= MIN_GROUP_SIZE
+    odds = parity & (positives >= MIN_OUTCOME_COUNT) & (negatives >= MIN_OUTCOME_COUNT)
+    return parity, odds
+
+
+# Bootstrap
+def _bootstrap_block(probs: np.ndarray, n: int, shape: Tuple[int, ...], slices: List,
+                     masks: List, replicates: int, seed) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    draws = rng.multinomial(n, probs, size=replicates).reshape((replicates,) + shape + (2, 2))
+
+    gaps = np.empty((replicates, len(slices), 2))
+    for s, keep in enumerate(slices):
+        counts = _group_counts(draws, keep, len(shape))
+        gaps[:, s, 0], gaps[:, s, 1] = _gaps(counts, *masks[s])
+    return gaps
+
+
+def bootstrap_gaps(tensor: np.ndarray, slices: List, masks: List,
+                   n_bootstrap: int = N_BOOTSTRAP, workers: int = 1,
+                   seed: int = RANDOM_STATE) -> np.ndarray:
+    """
+    (n_bootstrap, slices, [parity, odds]) gap replicates. Blocks use
+    independent child seeds, so results do not depend on `workers`.
+    """
+    n = int(tensor.sum())
+    probs = (tensor / n).ravel()
+    shape = tensor.shape[:-2]
+
+    sizes = [min(BOOTSTRAP_BLOCK, n_bootstrap - i) for i in range(0, n_bootstrap, BOOTSTRAP_BLOCK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(probs, n, shape, slices, masks, size, s) for size, s in zip(sizes, seeds)]
+
+    if workers <= 1:
+        blocks = [_bootstrap_block(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            blocks = list(pool.map(_bootstrap_block, *zip(*args)))
+
+    return np.concatenate(blocks)
+
+
+# Audit
+def _verdict(low: float, high: float, limit: float) -> str:
+    if np.isnan(low):
+        return "n/a"
+    if low > limit:
+        return "exceeds"
+    if high <= limit:
+        return "within"
+    return "inconclusive"
+
+
+def _float(value) -> Optional[float]:
+    return None if value is None or np.isnan(value) else round(float(value), 4)
+
+
+def _gap_summary(value: float, low: float, high: float, limit: float,
+                 compared: List[Dict], key: str) -> Dict:
+    summary = {
+        "gap": _float(value),
+        "ci": [_float(low), _float(high)],
+        "limit": limit,
+        "groups_compared": len(compared),
+        "verdict": _verdict(low, high, limit),
+    }
+    if compared:
+        # Groups at either end of the gap (by rejection rate or TPR)
+        summary["highest"] = max(compared, key=lambda r: r[key])["group"]
+        summary["lowest"] = min(compared, key=lambda r: r[key])["group"]
+    return summary
+
+
+def audit(groups: Dict[str, Tuple[np.ndarray, List[str]]], y_true: np.ndarray,
+          y_pred: np.ndarray, n_bootstrap: int = N_BOOTSTRAP, workers: int = 1,
+          seed: int = RANDOM_STATE) -> List[Dict]:
+    """
+    Per-slice group metrics and gaps with bootstrap CIs.
+    """
+    attributes = list(groups)
+    shape = tuple(len(groups[a][1]) for a in attributes)
+    cells = np.ravel_multi_index([groups[a][0] for a in attributes], shape)
+    tensor = confusion_tensor(cells, int(np.prod(shape)), y_true, y_pred).reshape(shape + (2, 2))
+
+    slices = [keep for k in range(1, len(attributes) + 1)
+              for keep in combinations(range(len(attributes)), k)]
+    counts = [_group_counts(tensor, keep, len(shape)) for keep in slices]
+    masks = [_masks(c) for c in counts]
+
+    observed = np.array([_gaps(c, *m) for c, m in zip(counts, masks)], dtype=np.float64)
+
+    # Basic (reverse percentile) interval: a max - min gap over noisy groups
+    # is biased upward, and its replicates more so, so percentile bounds
+    # would sit above the estimate for the deeper intersections. Where the
+    # bias is larger than the spread, the reflected bounds can exclude the
+    # estimate itself; they are widened to contain it, so a reported gap is
+    # never outside its own CI and the verdict cannot contradict it
+    replicates = bootstrap_gaps(tensor, slices, masks, n_bootstrap, workers, seed)
+    alpha = (1 - CONFIDENCE) / 2 * 100
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        q_low, q_high = np.nanpercentile(replicates, [alpha, 100 - alpha], axis=0)
+    low = np.minimum(np.maximum(2 * observed - q_high, 0), observed)
+    high = np.maximum(2 * observed - q_low, observed)
+
+    results = []
+    for s, keep in enumerate(slices):
+        names = [attributes[i] for i in keep]
+        rates = _rates(counts[s])
+        parity_mask, odds_mask = masks[s]
+        parity, odds = observed[s]
+
+        labels = [
+            dict(zip(names, (groups[a][1][c] for a, c in zip(names, index))))
+            for index in np.ndindex(*(shape[i] for i in keep))
+        ]
+        group_rows = [
+            {
+                "group": label,
+                "count": int(rates["count"][g]),
+                "rejection_rate": _float(rates["rejection_rate"][g]),
+                "tpr": _float(rates["tpr"][g]),
+                "fpr": _float(rates["fpr"][g]),
+                "in_parity_gap": bool(parity_mask[g]),
+                "in_odds_gap": bool(odds_mask[g]),
+            }
+            for g, label in enumerate(labels) if rates["count"][g] > 0
+        ]
+
+        results.append({
+            "attributes": names,
+            "demographic_parity": _gap_summary(
+                parity, low[s, 0], high[s, 0], MAX_PARITY_GAP,
+                [r for r in group_rows if r["in_parity_gap"]], "rejection_rate",
+            ),
+            "equalized_odds": _gap_summary(
+                odds, low[s, 1], high[s, 1], MAX_ODDS_GAP,
+                [r for r in group_rows if r["in_odds_gap"]], "tpr",
+            ),
+            "groups": group_rows,
+        })
+
+    return results
+
+
+# Reporting
+def _format_gap(summary: Dict) -> str:
+    if summary["gap"] is None:
+        return "–"
+    low, high = summary["ci"]
+    return f"{summary['gap']:.3f} [{low:.3f}, {high:.3f}]"
+
+
+def _format_group(group: Dict) -> str:
+    return " · ".join(group.values())
+
+
+def render_markdown(report: Dict) -> str:
+    lines = [
+        f"_Generated by `python -m training.fairness_audit` on {report['generated_at'][:10]}: "
+        f"{report['model']['name']} v{report['model']['version']}, "
+        f"{report['rows']:,} applicants, threshold {report['threshold']}, "
+        f"{report['bootstrap']['replicates']:,} bootstrap replicates, "
+        f"{report['bootstrap']['confidence']:.0%} CIs. "
+        f"Full results: `{report['report_path']}`._",
+        "",
+        "| Attributes | Groups | Parity gap [CI] | Verdict | Odds gap [CI] | Verdict |",
+        "|------------|-------:|-----------------|---------|---------------|---------|",
+    ]
+    for s in report["slices"]:
+        dp, eo = s["demographic_parity"], s["equalized_odds"]
+        lines.append(
+            f"| {' × '.join(s['attributes'])} | {dp['groups_compared']}/{len(s['groups'])} "
+            f"| {_format_gap(dp)} | {dp['verdict']} | {_format_gap(eo)} | {eo['verdict']} |"
+        )
+
+    flagged = [s for s in report["slices"] if s["demographic_parity"]["verdict"] == "exceeds"]
+    lines += [
+        "",
+        f"Limits: parity gap {MAX_PARITY_GAP}, odds gap {MAX_ODDS_GAP}. Groups enter a gap "
+        f"with at least {MIN_GROUP_SIZE} applicants (and {MIN_OUTCOME_COUNT} defaults and "
+        f"non-defaults for odds). CIs are basic bootstrap intervals, which offset the "
+        f"upward bias of max - min gaps over many small groups, widened where needed "
+        f"to contain the observed gap.",
+    ]
+    if flagged:
+        lines += ["", "Parity gaps significantly above the limit (highest vs lowest rejection rate):", ""]
+        lines += [
+            f"- {' × '.join(s['attributes'])}: {_format_group(s['demographic_parity']['highest'])} "
+            f"vs {_format_group(s['demographic_parity']['lowest'])}"
+            for s in flagged
+        ]
+
+    return "\n".join(lines)
+
+
+def update_markdown(markdown: str, path: Path = MARKDOWN_PATH):
+    text = path.read_text(encoding="utf-8")
+    if MARKER_START not in text or MARKER_END not in text:
+        raise RuntimeError(f"{path} has no {MARKER_START} / {MARKER_END} section")
+
+    head, rest = text.split(MARKER_START, 1)
+    _, tail = rest.split(MARKER_END, 1)
+    path.write_text(f"{head}{MARKER_START}\n{markdown}\n{MARKER_END}{tail}", encoding="utf-8")
+
+
+def run_audit(
+    version: Optional[str] = None,
+    data_path: str = DATA_PATH,
+    threshold: float = DECISION_THRESHOLD,
+    n_bootstrap: int = N_BOOTSTRAP,
+    workers: int = 1,
+    report_path: Path = REPORT_PATH,
+    markdown_path: Optional[Path] = MARKDOWN_PATH,
+) -> Dict:
+    from inference.model_bundle import MODEL_NAME, ModelBundle
+    from inference.predictor import CreditRiskPredictor
+
+    print("Loading data...")
+    df = pd.read_csv(data_path)
+
+    predictor = CreditRiskPredictor(threshold=threshold, bundle=ModelBundle(MODEL_NAME, version))
+    print(f"Scoring {len(df):,} applicants with {MODEL_NAME} v{predictor.bundle.version}...")
+    y_pred = predictor.predict_proba_batch(df) >= threshold
+    y_true = df[TARGET_COL].to_numpy()
+
+    print(f"Auditing intersections ({n_bootstrap:,} bootstrap replicates, {workers} workers)...")
+    start = time.perf_counter()
+    slices = audit(encode_groups(df), y_true, y_pred, n_bootstrap, workers)
+    elapsed = time.perf_counter() - start
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "model": {"name": MODEL_NAME, "version": str(predictor.bundle.version)},
+        "data": data_path,
+        "rows": len(df),
+        "threshold": threshold,
+        "bootstrap": {"replicates": n_bootstrap, "confidence": CONFIDENCE, "seed": RANDOM_STATE},
+        "report_path": str(report_path),
+        "slices": slices,
+    }
+
+    report_path = Path(report_path)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Audited {len(slices)} slices in {elapsed:.2f}s. Report saved at: {report_path}")
+
+    if markdown_path is not None:
+        update_markdown(render_markdown(report), Path(markdown_path))
+        print(f"Updated {markdown_path}")
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Intersectional fairness audit")
+    parser.add_argument("--version", default=None, help="Model version (default: latest)")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--threshold", type=float, default=DECISION_THRESHOLD)
+    parser.add_argument("--bootstrap", type=int, default=N_BOOTSTRAP)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--report", default=str(REPORT_PATH))
+    parser.add_argument("--no-markdown", action="store_true",
+                        help=f"Do not update {MARKDOWN_PATH}")
+    args = parser.parse_args()
+
+    run_audit(
+        version=args.version,
+        data_path=args.data,
+        threshold=args.threshold,
+        n_bootstrap=args.bootstrap,
+        workers=args.workers,
+        report_path=Path(args.report),
+        markdown_path=None if args.no_markdown else MARKDOWN_PATH,
+    )
+
+
+if __name__ == "__main__":
+    main()
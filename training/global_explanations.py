@@ -0,0 +1,244 @@
+"""
+Global Explanation Precomputation
+Explainable Credit Default Prediction System
+
+Computes SHAP values for the full dataset once per registered model
+version and stores them next to the version as float32 `.npy` matrices:
+
+    models/shap_store/<model_name>/v<version>/
+        shap_values.npy      (rows x features, float32)
+        feature_values.npy   (rows x features, float32)
+        groups.npz           (sensitive attributes, per row)
+        meta.json
+
+`ShapSummaryStore` memory-maps these files so global importances,
+dependence data and per-group mean attributions are cheap slices instead of
+fresh SHAP runs.
+
+Usage:
+    python -m training.global_explanations --workers 8
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from inference.model_bundle import MODEL_NAME, get_model_bundle, preload_for_fork
+
+# Configuration
+DATA_PATH = "data/processed/credit_data.csv"
+STORE_DIR = Path("models/shap_store")
+CHUNK_SIZE = 2_000
+GROUP_COLUMNS = ["gender", "education", "marital_status", "age"]
+
+_WORKER_MODEL_NAME = MODEL_NAME
+
+
+def store_path(model_name: str, version: str) -> Path:
+    return STORE_DIR / model_name / f"v{version}"
+
+
+# Computation
+def _shap_chunk(args):
+    start, X = args
+    explainer = get_model_bundle(_WORKER_MODEL_NAME).tree_explainer()
+
+    values = explainer.shap_values(X)
+    if isinstance(values, list):
+        values = values[1]
+
+    return start, values.astype(np.float32)
+
+
+def _init_worker(model_name: str):
+    global _WORKER_MODEL_NAME
+    _WORKER_MODEL_NAME = model_name
+
+
+def compute_shap_store(
+    data_path: str = DATA_PATH,
+    model_name: str = MODEL_NAME,
+    workers: int = 1,
+    chunk_size: int = CHUNK_SIZE,
+) -> Path:
+    bundle = get_model_bundle(model_name)
+    out_dir = store_path(model_name, bundle.version)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    print("Loading data...")
+    df = pd.read_csv(data_path)
+    X = df[bundle.features].to_numpy(dtype=np.float64)
+    n_rows, n_features = X.shape
+
+    shap_values = np.lib.format.open_memmap(
+        out_dir / "shap_values.npy", mode="w+",
+        dtype=np.float32, shape=(n_rows, n_features),
+    )
+    feature_values = np.lib.format.open_memmap(
+        out_dir / "feature_values.npy", mode="w+",
+        dtype=np.float32, shape=(n_rows, n_features),
+    )
+    feature_values[:] = X
+
+    np.savez(
+        out_dir / "groups.npz",
+        **{c: df[c].to_numpy() for c in GROUP_COLUMNS if c in df.columns},
+    )
+
+    chunks = ((s, X[s:s + chunk_size]) for s in range(0, n_rows, chunk_size))
+
+    print(f"Computing SHAP values for {n_rows} rows ({workers} workers)...")
+    _init_worker(model_name)
+    if workers <= 1:
+        for start, values in map(_shap_chunk, chunks):
+            shap_values[start:start + len(values)] = values
+    else:
+        # Build the explainer once, before forking, so workers share it
+        preload_for_fork(model_name, include_explainer=True)
+        context = mp.get_context("fork" if os.name == "posix" else "spawn")
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(model_name,),
+        ) as pool:
+            for start, values in pool.map(_shap_chunk, chunks):
+                shap_values[start:start + len(values)] = values
+
+    shap_values.flush()
+    feature_values.flush()
+
+    expected_value = bundle.tree_explainer().expected_value
+    expected_value = np.atleast_1d(expected_value)[-1]
+
+    meta = {
+        "model_name": model_name,
+        "model_version": bundle.version,
+        "run_id": bundle.run_id,
+        "features": bundle.features,
+        "n_rows": n_rows,
+        "expected_value": float(expected_value),
+        "data_path": str(data_path),
+    }
+    (out_dir / "meta.json").write_text(json.dumps(meta, indent=2))
+
+    print(f"SHAP store saved at: {out_dir}")
+    return out_dir
+
+
+# Serving
+class ShapSummaryStore:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.meta = json.loads((self.path / "meta.json").read_text())
+        self.features = self.meta["features"]
+
+        self.shap_values = np.load(self.path / "shap_values.npy", mmap_mode="r")
+        self.feature_values = np.load(self.path / "feature_values.npy", mmap_mode="r")
+        self.groups = dict(np.load(self.path / "groups.npz"))
+
+        self._importance = None
+
+    @classmethod
+    def load(cls, model_name: str = MODEL_NAME, version: Optional[str] = None):
+        if version is None:
+            version = get_latest_version(model_name)
+
+        path = store_path(model_name, version)
+        if not (path / "meta.json").exists():
+            raise FileNotFoundError(
+                f"No SHAP store for {model_name} v{version}; "
+                "run `python -m training.global_explanations` first"
+            )
+        return cls(path)
+
+    def global_importance(self) -> pd.Series:
+        """
+        Mean |SHAP| per feature, largest first.
+        """
+        if self._importance is None:
+            values = np.abs(self.shap_values).mean(axis=0, dtype=np.float64)
+            self._importance = pd.Series(
+                values, index=self.features, name="mean_abs_shap"
+            ).sort_values(ascending=False)
+
+        return self._importance
+
+    def dependence(self, feature: str, max_points: Optional[int] = None) -> pd.DataFrame:
+        """
+        Feature value vs SHAP value for one feature (one column slice each).
+        """
+        i = self.features.index(feature)
+        step = 1
+        if max_points and len(self.shap_values) > max_points:
+            step = len(self.shap_values) // max_points
+
+        return pd.DataFrame({
+            "value": self.feature_values[::step, i],
+            "shap_value": self.shap_values[::step, i],
+        })
+
+    def group_codes(self, group: str):
+        if group == "age_group":
+            labels = np.array(["young", "middle", "senior"])
+            codes = np.digitize(self.groups["age"], [30, 50], right=True)
+            return codes, labels
+
+        codes, labels = pd.factorize(self.groups[group], sort=True)
+        return codes, np.asarray(labels)
+
+    def group_mean_attributions(self, group: str) -> pd.DataFrame:
+        """
+        Mean SHAP value per feature for every level of a sensitive attribute
+        (gender, education, marital_status or age_group).
+        """
+        codes, labels = self.group_codes(group)
+        counts = np.bincount(codes, minlength=len(labels))
+
+        sums = np.stack([
+            np.bincount(codes, weights=self.shap_values[:, j], minlength=len(labels))
+            for j in range(len(self.features))
+        ], axis=1)
+
+        means = sums / np.maximum(counts, 1)[:, None]
+        frame = pd.DataFrame(means, index=labels, columns=self.features)
+        frame.insert(0, "n", counts)
+        return frame
+
+
+def get_latest_version(model_name: str = MODEL_NAME) -> str:
+    from mlflow.tracking import MlflowClient
+
+    versions = MlflowClient().get_latest_versions(model_name)
+    if not versions:
+        raise RuntimeError("No registered model versions found")
+    return str(versions[0].version)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute the global SHAP store")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--model-name", default=MODEL_NAME)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    path = compute_shap_store(
+        args.data, args.model_name, args.workers, args.chunk_size
+    )
+
+    store = ShapSummaryStore(path)
+    print("\nGlobal importance (mean |SHAP|):")
+    print(store.global_importance().head(10))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Local Job Queue
+Explainable Credit Default Prediction System
+
+SQLite-backed queue for pipeline jobs (e.g. drift-triggered retraining),
+shared by the drift scheduler (producer) and pipeline workers (consumers)
+on one machine. Claiming is a single `BEGIN IMMEDIATE` transaction, so
+concurrent workers never run the same job twice.
+
+Job states: queued -> running -> done | failed
+"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Configuration
+QUEUE_PATH = Path("data/jobs.sqlite")
+MAX_ATTEMPTS = 3
+STALE_AFTER_S = 6 * 3600   # running jobs older than this are requeued
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    payload TEXT NOT NULL DEFAULT '{}',
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+"""
+
+
+class JobQueue:
+    def __init__(self, path: Path = QUEUE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    # Producer
+    def enqueue(self, kind: str, payload: Optional[Dict] = None, dedupe: bool = True) -> Optional[int]:
+        """
+        Add a job. With `dedupe`, nothing is added (None is returned) while
+        a job of the same kind is already queued or running.
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            if dedupe and conn.execute(
+                "SELECT 1 FROM jobs WHERE kind = ? AND status IN ('queued', 'running')",
+                (kind,),
+            ).fetchone():
+                conn.execute("ROLLBACK")
+                return None
+
+            cursor = conn.execute(
+                "INSERT INTO jobs (kind, payload, created_at) VALUES (?, ?, ?)",
+                (kind, json.dumps(payload or {}), time.time()),
+            )
+            conn.execute("COMMIT")
+            return cursor.lastrowid
+        finally:
+            conn.close()
+
+    # Consumer
+    def claim(self, kind: Optional[str] = None) -> Optional[Dict]:
+        """
+        Atomically move the oldest queued job to running and return it.
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            self._requeue_stale(conn)
+
+            query = "SELECT * FROM jobs WHERE status = 'queued'"
+            params = ()
+            if kind:
+                query += " AND kind = ?"
+                params = (kind,)
+            row = conn.execute(query + " ORDER BY id LIMIT 1", params).fetchone()
+
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            conn.execute(
+                "UPDATE jobs SET status = 'running', started_at = ?, "
+                "attempts = attempts + 1 WHERE id = ?",
+                (time.time(), row["id"]),
+            )
+            conn.execute("COMMIT")
+            return self._as_dict(row, status="running")
+        finally:
+            conn.close()
+
+    def _requeue_stale(self, conn: sqlite3.Connection):
+        # A worker that died mid-job leaves it running; retry (or give up)
+        cutoff = time.time() - STALE_AFTER_S
+        conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, "
+            "error = 'worker lost' WHERE status = 'running' AND started_at < ?",
+            (MAX_ATTEMPTS, cutoff),
+        )
+
+    def complete(self, job_id: int, result: Optional[Dict] = None):
+        self._finish(job_id, "done", result=json.dumps(result or {}))
+
+    def fail(self, job_id: int, error: str):
+        self._finish(job_id, "failed", error=error)
+
+    def _finish(self, job_id: int, status: str, result: str = None, error: str = None):
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status, result, error, time.time(), job_id),
+            )
+        finally:
+            conn.close()
+
+    # Inspection
+    def get(self, job_id: int) -> Optional[Dict]:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return self._as_dict(row) if row else None
+        finally:
+            conn.close()
+
+    def jobs(self, status: Optional[str] = None, limit: int = 50) -> List[Dict]:
+        conn = self._connect()
+        try:
+            if status:
+                rows = conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY id DESC LIMIT ?",
+                    (status, limit),
+                )
+            else:
+                rows = conn.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,))
+            return [self._as_dict(r) for r in rows]
+        finally:
+            conn.close()
+
+    def last_finished(self, kind: str) -> Optional[Dict]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE kind = ? AND status = 'done' "
+                "ORDER BY finished_at DESC LIMIT 1",
+                (kind,),
+            ).fetchone()
+            return self._as_dict(row) if row else None
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _as_dict(row: sqlite3.Row, **updates) -> Dict:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        if job.get("result"):
+            job["result"] = json.loads(job["result"])
+        job.update(updates)
+        return job
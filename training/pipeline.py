@@ -0,0 +1,446 @@
+"""
+Retraining Pipeline (DAG)
+Explainable Credit Default Prediction System
+
+Retrain -> evaluate -> bias audit -> register, run as a DAG of stages.
+Stages whose inputs are ready run in parallel:
+
+    dataset ─┬─ train ── candidate_scores ─┬─ evaluate ───┬─ register
+             │                             ├─ bias_audit ─┘
+             └─ champion_scores ───────────┘
+
+(evaluate and bias_audit each read both candidate and champion scores)
+
+Intermediate artifacts are cached on disk under a key derived from their
+inputs (data file, split settings, model params, champion version), so a
+retried or repeated job reuses the dataset split, the candidate model and
+the held-out predictions instead of recomputing them:
+
+    models/pipeline_cache/<stage>-<key>.joblib
+
+The candidate is logged to the local MLflow store (mlruns / mlflow.db)
+either way, and registered only if it passes the promotion gates against
+the current champion (ROC-AUC, demographic parity gap, and training data
+that differs from the champion's: the `dataset_key` run tag).
+
+Usage:
+    python -m training.pipeline run             # run once, now
+    python -m training.pipeline worker [--once] # drain the job queue
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import joblib
+import numpy as np
+
+from inference.feature_schema import ID_COL
+from training.job_queue import JobQueue
+
+# Configuration
+DATA_PATH = "data/processed/credit_data.csv"
+CACHE_DIR = Path("models/pipeline_cache")
+JOB_KIND = "retrain"
+MAX_WORKERS = 4
+POLL_INTERVAL_S = 30
+DECISION_THRESHOLD = 0.4           # serving threshold (api/main.py)
+
+# Promotion gates (candidate vs champion on the same held-out split)
+AUC_TOLERANCE = 0.005              # candidate AUC may be at most this much lower
+PARITY_TOLERANCE = 0.02            # ... and its parity gap at most this much wider
+
+
+# DAG Runner
+class Stage:
+    def __init__(self, name: str, fn: Callable, deps: List[str] = ()):
+        self.name = name
+        self.fn = fn
+        self.deps = list(deps)
+
+
+def run_dag(stages: List[Stage], max_workers: int = MAX_WORKERS) -> Dict:
+    """
+    Run stages as soon as their dependencies have finished. Each stage is
+    called with its dependencies' results as keyword arguments. The first
+    failure stops scheduling and is re-raised once running stages finish.
+    """
+    names = {s.name for s in stages}
+    for stage in stages:
+        unknown = set(stage.deps) - names
+        if unknown:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stages {unknown}")
+
+    pending = {s.name: s for s in stages}
+    results, timings, running = {}, {}, {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                if all(d in results for d in stage.deps):
+                    del pending[name]
+                    print(f"[pipeline] start  {name}")
+                    kwargs = {d: results[d] for d in stage.deps}
+                    running[pool.submit(_timed, stage.fn, kwargs)] = stage
+
+            if not running:
+                raise ValueError(f"Dependency cycle between stages {sorted(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    results[stage.name], timings[stage.name] = future.result()
+                except Exception as e:
+                    pending.clear()
+                    raise RuntimeError(f"Stage '{stage.name}' failed: {e}") from e
+                print(f"[pipeline] done   {stage.name} ({timings[stage.name]:.1f}s)")
+
+    results["_timings"] = timings
+    return results
+
+
+def _timed(fn: Callable, kwargs: Dict):
+    start = time.perf_counter()
+    result = fn(**kwargs)
+    return result, time.perf_counter() - start
+
+
+# Artifact Cache
+class ArtifactCache:
+    def __init__(self, cache_dir: Path = CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hits, self.misses = [], []
+
+    @staticmethod
+    def key(*parts) -> str:
+        blob = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode()).hexdigest()[:16]
+
+    def get_or_compute(self, stage: str, key: str, compute: Callable):
+        path = self.cache_dir / f"{stage}-{key}.joblib"
+        if path.exists():
+            self.hits.append(stage)
+            return joblib.load(path)
+
+        self.misses.append(stage)
+        value = compute()
+        # Write-then-rename so a crashed job never leaves a partial entry
+        tmp = path.with_suffix(f".tmp{os.getpid()}")
+        joblib.dump(value, tmp)
+        os.replace(tmp, path)
+        return value
+
+
+# Pipeline
+class RetrainPipeline:
+    def __init__(
+        self,
+        data_path: str = DATA_PATH,
+        cache_dir: Path = CACHE_DIR,
+        threshold: float = DECISION_THRESHOLD,
+        register: bool = True,
+    ):
+        self.data_path = data_path
+        self.cache = ArtifactCache(cache_dir)
+        self.threshold = threshold
+        self.register = register
+
+    def stages(self, trigger: Optional[Dict] = None) -> List[Stage]:
+        return [
+            Stage("dataset", self.dataset),
+            Stage("train", self.train, ["dataset"]),
+            Stage("champion_scores", self.champion_scores, ["dataset"]),
+            Stage("candidate_scores", self.candidate_scores, ["dataset", "train"]),
+            Stage("evaluate", self.evaluate,
+                  ["dataset", "candidate_scores", "champion_scores"]),
+            Stage("bias_audit", self.bias_audit,
+                  ["dataset", "candidate_scores", "champion_scores"]),
+            Stage("register", lambda **deps: self.register_model(trigger=trigger, **deps),
+                  ["dataset", "train", "champion_scores", "evaluate", "bias_audit"]),
+        ]
+
+    def run(self, trigger: Optional[Dict] = None, max_workers: int = MAX_WORKERS) -> Dict:
+        results = run_dag(self.stages(trigger), max_workers=max_workers)
+
+        summary = {
+            **results["register"],
+            "evaluation": results["evaluate"],
+            "bias_audit": results["bias_audit"],
+            "timings_s": {k: round(v, 2) for k, v in results["_timings"].items()},
+            "cache_hits": self.cache.hits,
+        }
+        print(f"[pipeline] finished: registered_version={summary['registered_version']}, "
+              f"cache hits={self.cache.hits}")
+        return summary
+
+    # Stages
+    def dataset(self) -> Dict:
+        from training.train import dataset_key, load_data, split_calibration, split_data
+
+        # Content-based, so it is comparable with the champion's run tag
+        key = dataset_key(self.data_path)
+
+        def compute():
+            df = load_data(self.data_path)
+            X_train, X_test, y_train, y_test = split_data(df)
+            X_fit, X_cal, y_fit, y_cal = split_calibration(X_train, y_train)
+            return {
+                "X_fit": X_fit, "y_fit": y_fit,
+                "X_cal": X_cal, "y_cal": y_cal,
+                "X_test": X_test, "y_test": y_test,
+                # Older champions were trained with `id` as an input
+                "test_ids": df.loc[X_test.index, ID_COL] if ID_COL in df else None,
+            }
+
+        return {"key": key, **self.cache.get_or_compute("dataset", key, compute)}
+
+    def train(self, dataset: Dict) -> Dict:
+        from training.calibration import fit_calibration_table
+        from training.train import CALIBRATION_METHOD, MODEL_PARAMS, train_model
+
+        key = self.cache.key(dataset["key"], MODEL_PARAMS, CALIBRATION_METHOD)
+
+        def compute():
+            model = train_model(dataset["X_fit"], dataset["y_fit"])
+            calibration = fit_calibration_table(
+                dataset["y_cal"],
+                model.predict_proba(dataset["X_cal"])[:, 1],
+                method=CALIBRATION_METHOD,
+            )
+            return {"model": model, "calibration": calibration}
+
+        return {"key": key, **self.cache.get_or_compute("train", key, compute)}
+
+    def candidate_scores(self, dataset: Dict, train: Dict) -> np.ndarray:
+        # Held-out predictions, shared by evaluate and bias_audit
+        return self.cache.get_or_compute(
+            "candidate_scores", train["key"],
+            lambda: train["model"].predict_proba(dataset["X_test"])[:, 1],
+        )
+
+    def champion_scores(self, dataset: Dict) -> Optional[Dict]:
+        from mlflow.tracking import MlflowClient
+
+        from inference.model_bundle import MODEL_NAME, ModelBundle
+        from inference.predictor import CreditRiskPredictor
+
+        versions = MlflowClient().get_latest_versions(MODEL_NAME)
+        if not versions:
+            return None
+        version = str(versions[0].version)
+
+        def compute():
+            # A fresh bundle: the process-wide cache would pin an old "latest"
+            predictor = CreditRiskPredictor(bundle=ModelBundle(MODEL_NAME, version))
+            frame = dataset["X_test"]
+            if ID_COL in predictor.features:
+                frame = frame.assign(**{ID_COL: dataset["test_ids"]})
+            return predictor.predict_proba_batch(frame)
+
+        key = self.cache.key(dataset["key"], MODEL_NAME, version)
+        return {
+            "version": version,
+            "dataset_key": champion_dataset_key(version),
+            "probs": self.cache.get_or_compute("champion_scores", key, compute),
+        }
+
+    def evaluate(self, dataset: Dict, candidate_scores: np.ndarray,
+                 champion_scores: Optional[Dict]) -> Dict:
+        from training.evaluate import reliability_report
+        from training.train import score_metrics
+
+        y_test = dataset["y_test"]
+        results = {
+            "candidate": {k: float(v) for k, v in score_metrics(y_test, candidate_scores).items()},
+            "reliability": reliability_report(y_test, candidate_scores),
+        }
+        if champion_scores is not None:
+            results["champion"] = {
+                "version": champion_scores["version"],
+                **{k: float(v) for k, v in
+                   score_metrics(y_test, champion_scores["probs"]).items()},
+            }
+        return results
+
+    def bias_audit(self, dataset: Dict, candidate_scores: np.ndarray,
+                   champion_scores: Optional[Dict]) -> Dict:
+        from fairlearn.metrics import (
+            demographic_parity_difference,
+            equalized_odds_difference,
+        )
+
+        from monitoring.bias_drift import sensitive_groups
+
+        y_test = dataset["y_test"].to_numpy()
+        groups = sensitive_groups(dataset["X_test"])
+
+        def audit(probs: np.ndarray) -> Dict:
+            y_pred = (probs >= self.threshold).astype(int)
+            return {
+                attribute: {
+                    "demographic_parity_difference": float(
+                        demographic_parity_difference(y_test, y_pred, sensitive_features=labels)
+                    ),
+                    "equalized_odds_difference": float(
+                        equalized_odds_difference(y_test, y_pred, sensitive_features=labels)
+                    ),
+                }
+                for attribute, labels in groups.items()
+            }
+
+        results = {"threshold": self.threshold, "candidate": audit(candidate_scores)}
+        if champion_scores is not None:
+            results["champion"] = audit(champion_scores["probs"])
+        return results
+
+    def register_model(self, dataset: Dict, train: Dict, champion_scores: Optional[Dict],
+                       evaluate: Dict, bias_audit: Dict,
+                       trigger: Optional[Dict] = None) -> Dict:
+        import mlflow
+
+        from training.train import EXPERIMENT_NAME, log_model
+
+        champion_key = champion_scores["dataset_key"] if champion_scores else None
+        gates = self._gates(evaluate, bias_audit, dataset["key"], champion_key)
+        promote = self.register and all(g["passed"] for g in gates.values())
+
+        metrics = dict(evaluate["candidate"])
+        metrics["raw_ece"] = evaluate["reliability"]["ece"]
+        metrics["raw_brier"] = evaluate["reliability"]["brier"]
+
+        mlflow.set_experiment(EXPERIMENT_NAME)
+        with mlflow.start_run(run_name="lightgbm_credit_risk_retrain") as run:
+            mlflow.set_tag("trigger", json.dumps(trigger or {"reason": "manual"})[:5000])
+            mlflow.set_tag("promoted", str(promote))
+            mlflow.log_dict(bias_audit, "bias_audit.json")
+            mlflow.log_dict(gates, "promotion_gates.json")
+
+            info = log_model(
+                train["model"], train["calibration"], metrics,
+                {"raw": evaluate["reliability"]}, register=promote,
+                data_key=dataset["key"],
+            )
+
+        return {
+            "run_id": run.info.run_id,
+            "promoted": promote,
+            "registered_version": getattr(info, "registered_model_version", None) if promote else None,
+            "gates": gates,
+        }
+
+    @staticmethod
+    def _gates(evaluate: Dict, bias_audit: Dict, data_key: str,
+               champion_key: Optional[str] = None) -> Dict:
+        if "champion" not in evaluate:
+            return {"champion": {"passed": True, "detail": "no registered champion"}}
+
+        candidate_auc = evaluate["candidate"]["roc_auc"]
+        champion_auc = evaluate["champion"]["roc_auc"]
+        gates = {
+            # Same data, split and params reproduce the champion; promoting
+            # it again would not address the drift that triggered the job
+            "new_training_data": {
+                "passed": data_key != champion_key,
+                "candidate": data_key,
+                "champion": champion_key or "unknown (no dataset_key tag)",
+            },
+            "roc_auc": {
+                "passed": candidate_auc >= champion_auc - AUC_TOLERANCE,
+                "candidate": candidate_auc,
+                "champion": champion_auc,
+            }
+        }
+        for attribute, candidate in bias_audit["candidate"].items():
+            cand_gap = candidate["demographic_parity_difference"]
+            champ_gap = bias_audit["champion"][attribute]["demographic_parity_difference"]
+            gates[f"parity_{attribute}"] = {
+                "passed": cand_gap <= champ_gap + PARITY_TOLERANCE,
+                "candidate": cand_gap,
+                "champion": champ_gap,
+            }
+        return gates
+
+
+def champion_dataset_key(version: Optional[str] = None) -> Optional[str]:
+    """
+    `dataset_key` tag of the run behind a registered version (latest by
+    default). None without a champion or for models logged before the tag
+    existed.
+    """
+    from mlflow.tracking import MlflowClient
+
+    from inference.model_bundle import MODEL_NAME
+    from training.train import DATASET_KEY_TAG
+
+    client = MlflowClient()
+    if version is None:
+        versions = client.get_latest_versions(MODEL_NAME)
+        if not versions:
+            return None
+        run_id = versions[0].run_id
+    else:
+        run_id = client.get_model_version(MODEL_NAME, str(version)).run_id
+    return client.get_run(run_id).data.tags.get(DATASET_KEY_TAG)
+
+
+# Worker
+def run_worker(queue: JobQueue, once: bool = False, poll_interval: float = POLL_INTERVAL_S):
+    """
+    Claim retrain jobs from the local queue and run the pipeline for each.
+    """
+    while True:
+        job = queue.claim(JOB_KIND)
+        if job is None:
+            if once:
+                return
+            time.sleep(poll_interval)
+            continue
+
+        print(f"[worker] job {job['id']}: {job['payload'].get('reason', 'retrain')}")
+        try:
+            options = job["payload"].get("options", {})
+            summary = RetrainPipeline(**options).run(trigger=job["payload"])
+            queue.complete(job["id"], summary)
+        except Exception:
+            queue.fail(job["id"], traceback.format_exc())
+            print(f"[worker] job {job['id']} failed")
+
+        if once:
+            return
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retraining pipeline")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="Run the pipeline once, now")
+    run_parser.add_argument("--data", default=DATA_PATH)
+    run_parser.add_argument("--no-register", action="store_true")
+    run_parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+
+    worker_parser = sub.add_parser("worker", help="Run queued retrain jobs")
+    worker_parser.add_argument("--queue", default=None)
+    worker_parser.add_argument("--once", action="store_true")
+    worker_parser.add_argument("--poll", type=float, default=POLL_INTERVAL_S)
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        pipeline = RetrainPipeline(args.data, register=not args.no_register)
+        summary = pipeline.run(max_workers=args.workers)
+        print(json.dumps(summary["gates"], indent=2))
+    else:
+        queue = JobQueue(args.queue) if args.queue else JobQueue()
+        run_worker(queue, once=args.once, poll_interval=args.poll)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Synthetic Applicant Generator
+Explainable Credit Default Prediction System
+
+Gaussian copula fitted on the processed dataset, for driving training,
+bulk-scoring and monitoring at production volumes (1M-100M rows).
+
+- Marginals: exact empirical distribution for coded / low-cardinality
+  columns (gender, education, repayment status, age, credit limit,
+  default), an interpolated quantile function for bill / pay amounts
+- Dependence: correlation of the normal scores of all columns, corrected
+  so the synthetic rank correlations match the source's. The bill and pay
+  sequences, the repayment status codes and the target keep their joint
+  structure
+- Sampling is vectorized per chunk: correlated normals -> uniforms ->
+  inverse marginals. Chunk `i` is drawn from seed (seed, i), so a given
+  seed and chunk size always produce the same file.
+
+Usage:
+    python -m training.synthetic data/synthetic/applicants_10m.parquet \\
+        --rows 10000000 [--chunk-size 1000000] [--seed 42] [--no-target] [--report]
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr, ndtri
+
+from inference.feature_schema import CREDIT_SCHEMA, ID_COL, TARGET_COL
+
+# Configuration
+DATA_PATH = "data/processed/credit_data.csv"
+CHUNK_SIZE = 1_000_000
+RANDOM_STATE = 42
+MAX_DISCRETE_VALUES = 100     # up to this many distinct values -> exact support
+QUANTILE_KNOTS = 2_001        # resolution of the continuous quantile functions
+CALIBRATION_ROUNDS = 3
+CALIBRATION_SAMPLE = 100_000
+
+
+class GaussianCopula:
+    def __init__(self, columns: List[str], marginals: Dict[str, Dict],
+                 correlation: np.ndarray):
+        self.columns = columns
+        self.marginals = marginals
+        self.correlation = correlation
+        self._cholesky = np.linalg.cholesky(correlation)
+
+    # Fitting
+    @classmethod
+    def fit(
+        cls,
+        df: pd.DataFrame,
+        columns: Optional[List[str]] = None,
+        calibration_rounds: int = CALIBRATION_ROUNDS,
+        seed: int = RANDOM_STATE,
+    ) -> "GaussianCopula":
+        columns = columns or [c for c in df.columns if c != ID_COL]
+        n = len(df)
+
+        marginals, scores = {}, np.empty((n, len(columns)))
+        for j, col in enumerate(columns):
+            values = df[col].to_numpy()
+            marginals[col] = _fit_marginal(values)
+
+            # Mid-ranks -> normal scores (ties share one score)
+            ranks = pd.Series(values).rank(method="average").to_numpy()
+            scores[:, j] = ndtri(ranks / (n + 1))
+
+        copula = cls(columns, marginals, _nearest_correlation(np.corrcoef(scores, rowvar=False)))
+
+        # Discretizing the coded columns weakens their correlations, so the
+        # latent matrix is corrected until the synthetic rank correlations
+        # match the source's
+        target = _spearman(df[columns])
+        rng = np.random.default_rng([seed, 2**31])
+        for _ in range(calibration_rounds):
+            achieved = _spearman(copula.sample(CALIBRATION_SAMPLE, rng))
+            corr = np.clip(copula.correlation + (target - achieved), -0.999, 0.999)
+            np.fill_diagonal(corr, 1.0)
+            copula = cls(columns, marginals, _nearest_correlation(corr))
+
+        return copula
+
+    # Sampling
+    def sample(self, n: int, rng: np.random.Generator) -> pd.DataFrame:
+        z = rng.standard_normal((n, len(self.columns))) @ self._cholesky.T
+        u = ndtr(z)
+
+        return pd.DataFrame({
+            col: _inverse_marginal(self.marginals[col], u[:, j])
+            for j, col in enumerate(self.columns)
+        })
+
+    def chunks(self, rows: int, chunk_size: int = CHUNK_SIZE, seed: int = RANDOM_STATE,
+               start_id: int = 1) -> Iterator[pd.DataFrame]:
+        """
+        `rows` synthetic applicants in chunks, with sequential ids from
+        `start_id`.
+        """
+        for i, start in enumerate(range(0, rows, chunk_size)):
+            n = min(chunk_size, rows - start)
+            frame = self.sample(n, np.random.default_rng([seed, i]))
+            frame.insert(0, ID_COL, np.arange(start_id + start, start_id + start + n))
+            yield frame
+
+
+def _fit_marginal(values: np.ndarray) -> Dict:
+    support, counts = np.unique(values, return_counts=True)
+    integer = np.issubdtype(values.dtype, np.integer)
+
+    if len(support) <= MAX_DISCRETE_VALUES:
+        return {
+            "kind": "discrete",
+            "values": support,
+            "cdf": np.cumsum(counts) / counts.sum(),
+        }
+
+    return {
+        "kind": "continuous",
+        "quantiles": np.quantile(values, np.linspace(0, 1, QUANTILE_KNOTS)),
+        "integer": integer,
+    }
+
+
+def _inverse_marginal(marginal: Dict, u: np.ndarray) -> np.ndarray:
+    if marginal["kind"] == "discrete":
+        idx = np.searchsorted(marginal["cdf"], u, side="left")
+        return marginal["values"][np.minimum(idx, len(marginal["values"]) - 1)]
+
+    # Knots are evenly spaced in probability, so the bracketing knot is
+    # found by arithmetic instead of a search
+    quantiles = marginal["quantiles"]
+    position = u * (len(quantiles) - 1)
+    idx = np.minimum(position.astype(np.int64), len(quantiles) - 2)
+    frac = position - idx
+    values = quantiles[idx] + frac * (quantiles[idx + 1] - quantiles[idx])
+    return np.rint(values).astype(np.int64) if marginal["integer"] else values
+
+
+def _spearman(df: pd.DataFrame) -> np.ndarray:
+    corr = np.corrcoef(df.rank().to_numpy(), rowvar=False)
+    return np.nan_to_num(corr)
+
+
+def _nearest_correlation(corr: np.ndarray, min_eigenvalue: float = 1e-6) -> np.ndarray:
+    # Clip eigenvalues so the matrix stays positive definite (Cholesky)
+    w, v = np.linalg.eigh(corr)
+    corr = (v * np.maximum(w, min_eigenvalue)) @ v.T
+    d = np.sqrt(np.diag(corr))
+    return corr / np.outer(d, d)
+
+
+# Fidelity
+def fidelity_report(real: pd.DataFrame, synthetic: pd.DataFrame) -> Dict:
+    """
+    PSI per column (real as reference) and the largest absolute difference
+    between real and synthetic Spearman correlations.
+    """
+    from monitoring.psi import PSIReference
+
+    columns = [c for c in real.columns if c in synthetic.columns and c != ID_COL]
+    psi = PSIReference.fit(real, columns).psi(synthetic)
+
+    corr_real = real[columns].corr(method="spearman").to_numpy()
+    corr_synth = synthetic[columns].corr(method="spearman").to_numpy()
+    diff = np.abs(np.nan_to_num(corr_real - corr_synth))
+    i, j = np.unravel_index(np.argmax(diff), diff.shape)
+
+    return {
+        "max_psi": max(psi.values()),
+        "max_psi_column": max(psi, key=psi.get),
+        "max_corr_diff": float(diff[i, j]),
+        "max_corr_diff_pair": [columns[i], columns[j]],
+        "psi": psi,
+    }
+
+
+# Output
+def generate(
+    output_path: Path,
+    rows: int,
+    chunk_size: int = CHUNK_SIZE,
+    seed: int = RANDOM_STATE,
+    data_path: str = DATA_PATH,
+    include_target: bool = True,
+) -> Path:
+    from inference.batch_score import ChunkWriter
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if output_path.exists():
+        output_path.unlink()
+
+    print(f"Fitting Gaussian copula on {data_path}...")
+    source = pd.read_csv(data_path)
+    columns = CREDIT_SCHEMA.features + ([TARGET_COL] if include_target else [])
+    copula = GaussianCopula.fit(source, columns)
+
+    print(f"Generating {rows:,} applicants -> {output_path}")
+    writer = ChunkWriter(output_path)
+    start, written = time.perf_counter(), 0
+    try:
+        for chunk in copula.chunks(rows, chunk_size, seed):
+            writer.write(chunk)
+            written += len(chunk)
+            rate = written / (time.perf_counter() - start)
+            print(f"  {written:,} rows ({rate:,.0f} rows/s)")
+    finally:
+        writer.close()
+
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic applicants")
+    parser.add_argument("output", help="Output .csv or .parquet")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--seed", type=int, default=RANDOM_STATE)
+    parser.add_argument("--source", default=DATA_PATH)
+    parser.add_argument("--no-target", action="store_true",
+                        help="Omit the `default` column (scoring inputs only)")
+    parser.add_argument("--report", action="store_true",
+                        help="Compare the first chunk with the source data")
+    args = parser.parse_args()
+
+    path = generate(
+        Path(args.output), args.rows, args.chunk_size, args.seed,
+        args.source, include_target=not args.no_target,
+    )
+
+    if args.report:
+        from inference.batch_score import read_chunks
+
+        real = pd.read_csv(args.source)
+        report = fidelity_report(real, next(read_chunks(path, args.chunk_size)))
+        print(f"Max PSI: {report['max_psi']:.4f} ({report['max_psi_column']})")
+        print(f"Max Spearman correlation diff: {report['max_corr_diff']:.3f} "
+              f"{report['max_corr_diff_pair']}")
+
+
+if __name__ == "__main__":
+    main()
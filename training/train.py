@@ -3,6 +3,8 @@ Model Training Pipeline
 Explainable Credit Default Prediction System
 """
 
+import hashlib
+import json
 import os
 import pandas as pd
 import lightgbm as lgb
@@ -17,12 +19,30 @@ from sklearn.metrics import (
     recall_score
 )
 
+from inference.calibration import CALIBRATION_ARTIFACT
+from inference.feature_schema import CREDIT_SCHEMA, SCHEMA_ARTIFACT
+from training.calibration import fit_calibration_table
+from training.evaluate import reliability_report
+
 # Configuration
 DATA_PATH = "data/processed/credit_data.csv"
 TARGET_COL = "default"
 EXPERIMENT_NAME = "credit-risk-explainable-model"
 MODEL_NAME = "CreditRiskLightGBM"
 RANDOM_STATE = 42
+CALIBRATION_METHOD = "isotonic"   # or "platt"
+CALIBRATION_SIZE = 0.2            # share of the training split held out
+DATASET_KEY_TAG = "dataset_key"   # run tag identifying the training data
+
+MODEL_PARAMS = {
+    "n_estimators": 300,
+    "learning_rate": 0.05,
+    "max_depth": 6,
+    "subsample": 0.8,
+    "colsample_bytree": 0.8,
+    "random_state": RANDOM_STATE,
+    "verbosity": -1,
+}
 
 
 # Utility Functions
@@ -32,8 +52,24 @@ def load_data(path: str) -> pd.DataFrame:
     return pd.read_csv(path)
 
 
+def dataset_key(path: str) -> str:
+    """
+    Fingerprint of the training data: file content, split settings and
+    feature list. Logged as the `dataset_key` run tag, so a retrain can
+    tell whether it saw different data than the champion.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+
+    parts = [digest.hexdigest(), RANDOM_STATE, CALIBRATION_SIZE, CREDIT_SCHEMA.features]
+    return hashlib.sha256(json.dumps(parts).encode()).hexdigest()[:16]
+
+
 def split_data(df: pd.DataFrame):
-    X = df.drop(columns=[TARGET_COL])
+    # Model inputs only: `id` and the target never reach the model
+    X = CREDIT_SCHEMA.select(df)
     y = df[TARGET_COL]
 
     return train_test_split(
@@ -45,9 +81,23 @@ def split_data(df: pd.DataFrame):
     )
 
 
+def split_calibration(X_train, y_train):
+    return train_test_split(
+        X_train,
+        y_train,
+        test_size=CALIBRATION_SIZE,
+        stratify=y_train,
+        random_state=RANDOM_STATE,
+    )
+
+
 def evaluate_model(model, X_test, y_test):
-    y_pred = model.predict(X_test)
-    y_prob = model.predict_proba(X_test)[:, 1]
+    return score_metrics(y_test, model.predict_proba(X_test)[:, 1])
+
+
+def score_metrics(y_test, y_prob):
+    # Same labels as model.predict() for a binary LightGBM classifier
+    y_pred = (y_prob > 0.5).astype(int)
 
     return {
         "roc_auc": roc_auc_score(y_test, y_prob),
@@ -57,6 +107,41 @@ def evaluate_model(model, X_test, y_test):
     }
 
 
+def train_model(X_fit, y_fit) -> lgb.LGBMClassifier:
+    model = lgb.LGBMClassifier(**MODEL_PARAMS)
+    model.fit(X_fit, y_fit)
+    return model
+
+
+def log_model(model, calibration, metrics, reliability, register: bool = True,
+              data_key: str = None):
+    """
+    Log metrics, calibration, schema and the model to the active MLflow run;
+    with `register`, also create a new registry version.
+    """
+    if data_key:
+        mlflow.set_tag(DATASET_KEY_TAG, data_key)
+
+    for k, v in metrics.items():
+        mlflow.log_metric(k, v)
+
+    # Calibration is registered alongside the model (same run)
+    mlflow.log_param("calibration_method", calibration.method)
+    mlflow.log_dict(calibration.to_dict(), CALIBRATION_ARTIFACT)
+    mlflow.log_dict(reliability, "reliability_report.json")
+
+    # CRITICAL: Log feature schema as MLflow metadata
+    mlflow.log_dict(CREDIT_SCHEMA.to_dict(), SCHEMA_ARTIFACT)
+    mlflow.log_param("features", ",".join(CREDIT_SCHEMA.features))
+
+    print("Logging model to MLflow registry..." if register else "Logging model to MLflow...")
+    return mlflow.lightgbm.log_model(
+        model,
+        artifact_path="model",
+        registered_model_name=MODEL_NAME if register else None,
+    )
+
+
 # Training Pipeline
 def train():
     mlflow.set_experiment(EXPERIMENT_NAME)
@@ -68,40 +153,33 @@ def train():
 
         print("Splitting data...")
         X_train, X_test, y_train, y_test = split_data(df)
+        X_fit, X_cal, y_fit, y_cal = split_calibration(X_train, y_train)
 
         print("Training LightGBM model...")
-        model = lgb.LGBMClassifier(
-            n_estimators=300,
-            learning_rate=0.05,
-            max_depth=6,
-            subsample=0.8,
-            colsample_bytree=0.8,
-            random_state=RANDOM_STATE,
-            verbosity=-1,
-        )
+        model = train_model(X_fit, y_fit)
 
-        model.fit(X_train, y_train)
+        print(f"Fitting {CALIBRATION_METHOD} calibration on held-out split...")
+        calibration = fit_calibration_table(
+            y_cal, model.predict_proba(X_cal)[:, 1], method=CALIBRATION_METHOD
+        )
 
         print("Evaluating model...")
         metrics = evaluate_model(model, X_test, y_test)
 
-        for k, v in metrics.items():
-            mlflow.log_metric(k, v)
-
-        # CRITICAL: Log feature schema as MLflow metadata
-        feature_list = list(X_train.columns)
-        mlflow.log_param("features", ",".join(feature_list))
+        y_prob = model.predict_proba(X_test)[:, 1]
+        reliability = {
+            "raw": reliability_report(y_test, y_prob),
+            "calibrated": reliability_report(y_test, calibration.apply(y_prob)),
+        }
+        for stage, report in reliability.items():
+            metrics[f"{stage}_ece"] = report["ece"]
+            metrics[f"{stage}_brier"] = report["brier"]
 
-        print("Logging model to MLflow registry...")
-        mlflow.lightgbm.log_model(
-            model,
-            artifact_path="model",
-            registered_model_name=MODEL_NAME,
-        )
+        log_model(model, calibration, metrics, reliability, data_key=dataset_key(DATA_PATH))
 
         print("Training complete")
         print("Metrics:", metrics)
 
 
 if __name__ == "__main__":
-    train()
\ No newline at end of file
+    train()